@@ -1,18 +1,30 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Header #, status, BackgroundTasks
 from typing import List, Optional
-# import os
+import os
+import asyncio
 # import shutil
 import uuid
-# import json
+import json
+import base64
 # from datetime import datetime
 
 from .core.config import settings
 from .core.appwrite import appwrite_service
 from .core.auth import get_current_user, require_recruiter
 from .schemas import Job, JobCreate #, Candidate, CandidateCreate, Application, ApplicationCreate
-from .worker import queue, parse_resume_and_index
-from .services.vector_store import vector_store
+from .worker import queue, parse_resume_and_index, enqueue_batch, cancel_batch, requeue_batch, remove_candidate_from_index
+from .services.vector_store import vector_store, AGGREGATIONS
 from .services.embeddings import embedding_service
+from .services.match_cache import match_cache
+from .services.sparse import bm25_encoder
+from .services.skills import normalize_skill
+from .services.rate_limiter import gemini_limiter
+from .services.gpt_parser import parser
+from .services.uploads import (
+    validate_upload, UploadRejected, is_allowed_resume,
+    open_resume_archive, iter_archive_entries, spool_archive_entry
+)
+from fastapi.concurrency import run_in_threadpool
 from appwrite.id import ID
 import logging
 
@@ -101,20 +113,15 @@ async def apply_to_job_endpoint(
     db = appwrite_service.get_database()
     storage = appwrite_service.get_storage()
 
-    # 2. Upload Resume to Appwrite Storage
-    file_content = await file.read()
-    # Appwrite Python SDK required 'InputFile' for uploads usually, or just bytes/path
-    # check sdk usage: storage.create_file(bucket_id, file_id, file)
-    # file needs to be InputFile.from_bytes or path
-    from appwrite.input_file import InputFile
-    
-    input_file = InputFile.from_bytes(file_content, filename=file.filename, mime_type=file.content_type)
-    
-    uploaded_file = storage.create_file(
-        bucket_id=settings.RESUMES_BUCKET_ID,
-        file_id=ID.unique(),
-        file=input_file
-    )
+    # 2. Validate the resume where the framework spooled it, then upload it to Appwrite Storage.
+    # Bad types / oversized files are rejected before anything is sent upstream.
+    try:
+        resume = await run_in_threadpool(validate_upload, file.file, file.filename, file.content_type, file.size)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    with resume:
+        uploaded_file = await run_in_threadpool(_store_resume, storage, resume)
     file_id = uploaded_file['$id']
 
     # 3. Create/Find Candidate
@@ -140,7 +147,8 @@ async def apply_to_job_endpoint(
         "skills": []
     }
     
-    candidate_doc = db.create_document(
+    candidate_doc = await run_in_threadpool(
+        db.create_document,
         database_id=settings.DATABASE_ID,
         collection_id=settings.CANDIDATES_COLLECTION_ID,
         document_id=ID.unique(),
@@ -156,7 +164,8 @@ async def apply_to_job_endpoint(
         "status": "pending"
     }
     
-    application_doc = db.create_document(
+    application_doc = await run_in_threadpool(
+        db.create_document,
         database_id=settings.DATABASE_ID,
         collection_id=settings.APPLICATIONS_COLLECTION_ID,
         document_id=ID.unique(),
@@ -171,8 +180,29 @@ async def apply_to_job_endpoint(
 
 # --- Match / Search ---
 
-@router.post("/jobs/{job_id}/match")
-def match_candidates(job_id: str, user: dict = Depends(require_recruiter)):
+def _encode_match_cursor(job_id: str, offset: int) -> str:
+    payload = json.dumps({"job_id": job_id, "offset": offset}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def _decode_match_cursor(job_id: str, cursor: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["job_id"] != job_id:
+            raise ValueError("cursor belongs to another job")
+        return max(0, int(payload["offset"]))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+def _job_query_text(job: dict) -> str:
+    return f"{job['title']} {job['requirements']} {job['description']}"
+
+def _parse_skill_keys(must_have_skills: Optional[str]) -> List[str]:
+    # Comma-separated, aliases allowed; normalized to the indexed skill_keys
+    return sorted({normalize_skill(s) for s in (must_have_skills or "").split(",") if s.strip()})
+
+def _rank_candidates(job_id: str, window: int, aggregation: Optional[str], score_threshold: Optional[float],
+                     skill_keys: List[str], min_experience_years: Optional[float]) -> list:
+    """Ranks the top `window` applicants for a job (one batched vector search)."""
     db = appwrite_service.get_database()
     
     # Get Job Description
@@ -184,93 +214,339 @@ def match_candidates(job_id: str, user: dict = Depends(require_recruiter)):
     
     logger.info(f"Matching candidates for job: {job.get('title', job_id)} ({job_id})")
     
-    # Generate Embedding for job description
-    # Ideally should cache this
-    query_text = f"{job['title']} {job['requirements']} {job['description']}"
+    # Generate Embedding for job description (served from the embedding cache on repeat matches)
+    query_text = _job_query_text(job)
     query_vec = embedding_service.generate_embedding(query_text)
     
     # Search Qdrant for embeddings similar to job description embedding filtering by job id SCORING HAPPENS HERE
     results = vector_store.search_vectors( 
         query_embedding=query_vec,
-        top_k=50,
-        filter_metadata={"job_id": job_id}  
+        top_k=window,
+        filter_metadata={"job_id": job_id},
+        aggregation=aggregation,
+        offset=0,
+        score_threshold=score_threshold,
+        sparse_query=bm25_encoder.encode_query(query_text),
+        must_have_skills=skill_keys,
+        min_experience_years=min_experience_years
     ) 
     
-    logger.info(f"Found {len(results)} candidates for job {job_id}")
+    logger.info(f"Found {len(results)} candidates for job {job_id} (window {window})")
 
     # Fetch full candidate details from Appwrite or just return metadata
     # Metadata has basic info.
     
-    response = []
+    # Hybrid scores are normalized rank fusion: they say how a candidate ranks
+    # against this pool, not how similar the resume is, so no percentage
+    rank_fused = (aggregation or settings.MATCH_AGGREGATION) == "hybrid"
+    matches = []
     for hit in results:
-        response.append({
+        match = {
             "candidate_id": hit['metadata']['candidate_id'],
             "score": hit['score'],
-            "match_percentage": round(hit['score'] * 100, 2), # approx
+            "match_percentage": None if rank_fused else round(hit['score'] * 100, 2), # approx
+            "section_scores": {name: round(score, 4) for name, score in hit['section_scores'].items()},
             # Fetch Candidate Doc?
             # "details": ...
-        })
-        
-    return response
+        }
+        if rank_fused:
+            match["rank_score"] = round(hit['score'], 4)
+        matches.append(match)
+    return matches
+
+@router.post("/jobs/{job_id}/match")
+def match_candidates(
+    job_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    score_threshold: Optional[float] = None,
+    aggregation: Optional[str] = None,
+    must_have_skills: Optional[str] = None,
+    min_experience_years: Optional[float] = None,
+    user: dict = Depends(require_recruiter)
+):
+    """
+    Ranks the job's applicants by similarity between the job description and each
+    resume's section vectors. `aggregation` overrides MATCH_AGGREGATION: max, mean
+    or weighted combine section similarities, while "hybrid" fuses the section
+    rankings with a keyword (BM25) ranking server-side. Hybrid scores are
+    rank-relative, so those results have `rank_score` and no `match_percentage`.
+    Returns one page of `limit` results (default MATCH_DEFAULT_LIMIT) with scores
+    >= score_threshold, starting at `offset` or at the position encoded in `cursor`.
+    `next_cursor` fetches the following page and is null on the last one.
+    `must_have_skills` (comma-separated, aliases allowed) and `min_experience_years`
+    restrict the candidate pool through indexed payload filters inside the search.
+
+    Applicants are ranked in windows of MATCH_RANK_WINDOW results; a window is
+    cached per job (until the worker indexes or removes an application for it)
+    and pages are sliced from it, so consecutive pages never overlap or skip and
+    most page requests are a single cache read. A cache miss ranks everything
+    up to offset + limit (rounded up to the window), so deeper pages cost more;
+    offset is capped at MATCH_MAX_OFFSET.
+    """
+    if aggregation is not None and aggregation not in AGGREGATIONS:
+        raise HTTPException(status_code=400, detail=f"aggregation must be one of {', '.join(AGGREGATIONS)}")
+    limit = limit or settings.MATCH_DEFAULT_LIMIT
+    if not 1 <= limit <= settings.MATCH_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {settings.MATCH_MAX_LIMIT}")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must be >= 0")
+    if min_experience_years is not None and min_experience_years < 0:
+        raise HTTPException(status_code=400, detail="min_experience_years must be >= 0")
+    if cursor:
+        offset = _decode_match_cursor(job_id, cursor)
+    if offset > settings.MATCH_MAX_OFFSET:
+        raise HTTPException(status_code=400, detail=f"offset must be <= {settings.MATCH_MAX_OFFSET}; narrow the search with filters or score_threshold")
+    skill_keys = _parse_skill_keys(must_have_skills)
+
+    # Smallest multiple of the window that covers this page plus one result (to know if more exist)
+    window_size = max(1, settings.MATCH_RANK_WINDOW)
+    window = -(-(offset + limit + 1) // window_size) * window_size
+
+    cache_variant = (
+        f"{aggregation or settings.MATCH_AGGREGATION}:{score_threshold}:{window}"
+        f":{'|'.join(skill_keys)}:{min_experience_years}"
+    )
+    ranking, cache_version = match_cache.get(job_id, cache_variant)
+    if ranking is not None:
+        logger.info(f"Match cache hit for job {job_id} (version {cache_version})")
+    else:
+        ranking = _rank_candidates(job_id, window, aggregation, score_threshold, skill_keys, min_experience_years)
+        match_cache.set(job_id, cache_variant, cache_version, ranking)
+
+    has_more = len(ranking) > offset + limit
+    return {
+        "job_id": job_id,
+        "results": ranking[offset:offset + limit],
+        "offset": offset,
+        "limit": limit,
+        "next_cursor": _encode_match_cursor(job_id, offset + limit) if has_more else None
+    }
+
+@router.post("/talent/search")
+def search_talent(
+    query: Optional[str] = None,
+    job_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    score_threshold: Optional[float] = None,
+    must_have_skills: Optional[str] = None,
+    min_experience_years: Optional[float] = None,
+    user: dict = Depends(require_recruiter)
+):
+    """
+    Searches the whole talent pool, across every job's applicants, for a free-text
+    `query` or for the description of `job_id` (e.g. a new opening). Hits are
+    grouped by person (normalized resume email, else candidate) inside Qdrant,
+    so each person appears once with their best-matching application. Scores are
+    hybrid rank fusion, so results have `rank_score` and no `match_percentage`,
+    and score_threshold applies to the rank score. Filters work as in match.
+    """
+    if not query and not job_id:
+        raise HTTPException(status_code=400, detail="query or job_id is required")
+    limit = limit or settings.TALENT_SEARCH_DEFAULT_LIMIT
+    if not 1 <= limit <= settings.TALENT_SEARCH_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {settings.TALENT_SEARCH_MAX_LIMIT}")
+    if min_experience_years is not None and min_experience_years < 0:
+        raise HTTPException(status_code=400, detail="min_experience_years must be >= 0")
+
+    query_text = query
+    if job_id:
+        db = appwrite_service.get_database()
+        job = db.get_document(
+            database_id=settings.DATABASE_ID,
+            collection_id=settings.JOBS_COLLECTION_ID,
+            document_id=job_id
+        )
+        query_text = f"{_job_query_text(job)} {query or ''}".strip()
+
+    results = vector_store.search_talent_pool(
+        query_embedding=embedding_service.generate_embedding(query_text),
+        sparse_query=bm25_encoder.encode_query(query_text),
+        limit=limit,
+        score_threshold=score_threshold,
+        must_have_skills=_parse_skill_keys(must_have_skills),
+        min_experience_years=min_experience_years
+    )
+    logger.info(f"Talent search found {len(results)} candidates")
+    return {
+        "results": [
+            {
+                "candidate_id": hit['candidate_id'],
+                "score": hit['score'],
+                # Rank-relative like hybrid match, not a similarity
+                "match_percentage": None,
+                "rank_score": round(hit['score'], 4),
+                "best_match": {
+                    "job_id": hit['metadata'].get('job_id'),
+                    "application_id": hit['metadata'].get('application_id')
+                }
+            }
+            for hit in results
+        ],
+        "limit": limit
+    }
 
 # --- Batch Upload ---
+
+def _store_resume(storage, resume) -> dict:
+    """Uploads a validated resume to the resumes bucket. Blocking; run in the threadpool."""
+    return storage.create_file(
+        bucket_id=settings.RESUMES_BUCKET_ID,
+        file_id=ID.unique(),
+        file=resume.to_input_file()
+    )
+
+def _ingest_resume(job_id: str, batch_id: str, spooled) -> str:
+    """
+    Uploads a validated resume and creates its candidate + application documents.
+    Blocking SDK calls; run in the threadpool. Returns the application ID.
+    Parsing is enqueued for the whole batch at once afterwards (see _enqueue_batch_results).
+    """
+    db = appwrite_service.get_database()
+    storage = appwrite_service.get_storage()
+
+    uploaded = _store_resume(storage, spooled)
+
+    # Create Candidate & App
+    cand = db.create_document(
+        database_id=settings.DATABASE_ID,
+        collection_id=settings.CANDIDATES_COLLECTION_ID,
+        document_id=ID.unique(),
+        data={
+            "name": spooled.filename,
+            "email": "batch@pending",
+            "experience_years": 0.0,
+            "skills": []
+        }
+    )
+
+    app = db.create_document(
+        database_id=settings.DATABASE_ID,
+        collection_id=settings.APPLICATIONS_COLLECTION_ID,
+        document_id=ID.unique(),
+        data={
+            "job_id": job_id,
+            "candidate_id": cand['$id'],
+            "resume_file_id": uploaded['$id'],
+            "status": "pending",
+            "batch_id": batch_id
+        }
+    )
+
+    return app['$id']
+
+async def _ingest_batch_file(job_id: str, batch_id: str, file: UploadFile, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        try:
+            spooled = await run_in_threadpool(validate_upload, file.file, file.filename, file.content_type, file.size)
+        except UploadRejected as e:
+            logger.warning(f"Batch {batch_id}: rejected {file.filename}: {e}")
+            return {"filename": file.filename, "status": "rejected", "error": str(e)}
+
+        return await _ingest_spooled(job_id, batch_id, spooled)
+
+async def _ingest_spooled(job_id: str, batch_id: str, spooled) -> dict:
+    try:
+        with spooled:
+            application_id = await run_in_threadpool(_ingest_resume, job_id, batch_id, spooled)
+    except Exception as e:
+        logger.error(f"Batch {batch_id}: failed to ingest {spooled.filename}: {e}")
+        return {"filename": spooled.filename, "status": "failed", "error": str(e)}
+    return {"filename": spooled.filename, "status": "created", "application_id": application_id}
+
+async def _ingest_spooled_and_release(job_id: str, batch_id: str, spooled, semaphore: asyncio.Semaphore) -> dict:
+    try:
+        return await _ingest_spooled(job_id, batch_id, spooled)
+    finally:
+        semaphore.release()
+
+async def _enqueue_batch_results(batch_id: str, results: list):
+    """Enqueues all created applications of a batch in pipelined writes and updates their status."""
+    created = [r for r in results if r['status'] == 'created']
+    try:
+        await run_in_threadpool(enqueue_batch, [r['application_id'] for r in created], batch_id)
+        status, error = "queued", None
+    except Exception as e:
+        logger.error(f"Batch {batch_id}: failed to enqueue {len(created)} applications: {e}")
+        status, error = "failed", str(e)
+    for r in created:
+        r['status'] = status
+        if error:
+            r['error'] = error
+
+def _batch_report(job_id: str, batch_id: str, results: list) -> dict:
+    queued = sum(1 for r in results if r['status'] == 'queued')
+    logger.info(f"Batch {batch_id}: queued {queued}/{len(results)} files for job {job_id}")
+    return {
+        "message": f"Queued {queued} files",
+        "batch_id": batch_id,
+        "total": len(results),
+        "queued": queued,
+        "failed": len(results) - queued,
+        "results": results
+    }
+
 @router.post("/recruiter/jobs/{job_id}/batch-upload")
 async def batch_upload(
     job_id: str,
     files: List[UploadFile] = File(...),
     user: dict = Depends(require_recruiter)
 ):
-    # TODO: Implement batch logic
-    # Iterate files, upload to storage, create app/candidate, enqueue
-    
-    count = 0
-    batch_id = str(uuid.uuid4()) # Logical batch ID? 
-    # Maybe store batch_id in application doc to track?
-    
-    db = appwrite_service.get_database()
-    storage = appwrite_service.get_storage()
-    from appwrite.input_file import InputFile
-
-    for file in files:
-        file_content = await file.read()
-        input_file = InputFile.from_bytes(file_content, filename=file.filename, mime_type=file.content_type)
-        
-        uploaded = storage.create_file(
-            bucket_id=settings.RESUMES_BUCKET_ID,
-            file_id=ID.unique(),
-            file=input_file
-        )
-        
-        # Create Candidate & App
-        cand = db.create_document(
-            database_id=settings.DATABASE_ID,
-            collection_id=settings.CANDIDATES_COLLECTION_ID,
-            document_id=ID.unique(),
-            data={
-                "name": file.filename,
-                "email": "batch@pending",
-                "experience_years": 0.0,
-                "skills": []
-            } 
-        )
-        
-        app = db.create_document(
-            database_id=settings.DATABASE_ID,
-            collection_id=settings.APPLICATIONS_COLLECTION_ID,
-            document_id=ID.unique(),
-            data={
-                "job_id": job_id,
-                "candidate_id": cand['$id'],
-                "resume_file_id": uploaded['$id'],
-                "status": "pending",
-                "batch_id": batch_id
-            }
-        )
-        
-        queue.enqueue(parse_resume_and_index, app['$id'])
-        count += 1
+    # Files are ingested concurrently (upload, candidate + application docs, enqueue),
+    # at most BATCH_UPLOAD_CONCURRENCY at a time, off the event loop.
+    batch_id = str(uuid.uuid4())
+    semaphore = asyncio.Semaphore(max(1, settings.BATCH_UPLOAD_CONCURRENCY))
+
+    results = list(await asyncio.gather(*[
+        _ingest_batch_file(job_id, batch_id, file, semaphore) for file in files
+    ]))
+    await _enqueue_batch_results(batch_id, results)
+
+    return _batch_report(job_id, batch_id, results)
+
+@router.post("/recruiter/jobs/{job_id}/batch-upload-archive")
+async def batch_upload_archive(
+    job_id: str,
+    archive: UploadFile = File(...),
+    user: dict = Depends(require_recruiter)
+):
+    # Entries are streamed out of the ZIP one at a time (never unpacked to disk or RAM
+    # as a whole) and fed into the same ingest pipeline as batch_upload. The semaphore
+    # is taken before spooling, so at most BATCH_UPLOAD_CONCURRENCY entries are in flight.
+    batch_id = str(uuid.uuid4())
+    semaphore = asyncio.Semaphore(max(1, settings.BATCH_UPLOAD_CONCURRENCY))
+
+    try:
+        zip_file = await run_in_threadpool(open_resume_archive, archive.file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    results = []
+    tasks = []
+    with zip_file:
+        for info in iter_archive_entries(zip_file):
+            filename = os.path.basename(info.filename)
+            if not is_allowed_resume(filename):
+                results.append({"filename": filename, "status": "skipped", "error": "file type not allowed"})
+                continue
+
+            await semaphore.acquire()
+            try:
+                spooled = await run_in_threadpool(spool_archive_entry, zip_file, info)
+            except Exception as e:
+                semaphore.release()
+                logger.warning(f"Batch {batch_id}: rejected archive entry {info.filename}: {e}")
+                status = "rejected" if isinstance(e, UploadRejected) else "failed"
+                results.append({"filename": filename, "status": status, "error": str(e)})
+                continue
+
+            tasks.append(asyncio.create_task(_ingest_spooled_and_release(job_id, batch_id, spooled, semaphore)))
 
-    return {"message": f"Queued {count} files", "batch_id": batch_id}
+        results.extend(await asyncio.gather(*tasks))
+
+    await _enqueue_batch_results(batch_id, results)
+    return _batch_report(job_id, batch_id, results)
 
 @router.get("/recruiter/batch/{batch_id}")
 def get_batch_status(batch_id: str, user: dict = Depends(require_recruiter)):
@@ -298,6 +574,7 @@ def get_batch_status(batch_id: str, user: dict = Depends(require_recruiter)):
     processed = sum(1 for doc in documents if doc.get('status') == 'processed')
     pending = sum(1 for doc in documents if doc.get('status') == 'pending')
     errors = sum(1 for doc in documents if doc.get('status') == 'error' or doc.get('status') == 'failed')
+    cancelled = sum(1 for doc in documents if doc.get('status') == 'cancelled')
     
     error_samples = [
         doc.get('parsed_summary') for doc in documents 
@@ -310,5 +587,85 @@ def get_batch_status(batch_id: str, user: dict = Depends(require_recruiter)):
         "processed": processed,
         "pending": pending,
         "errors": errors,
+        "cancelled": cancelled,
         "error_samples": error_samples
     }
+
+@router.post("/recruiter/batch/{batch_id}/cancel")
+def cancel_batch_endpoint(batch_id: str, user: dict = Depends(require_recruiter)):
+    cancelled = cancel_batch(batch_id)
+    return {"batch_id": batch_id, "cancelled": cancelled}
+
+@router.post("/recruiter/batch/{batch_id}/requeue")
+def requeue_batch_endpoint(batch_id: str, user: dict = Depends(require_recruiter)):
+    requeued = requeue_batch(batch_id)
+    return {"batch_id": batch_id, "requeued": requeued}
+
+# --- Candidates ---
+
+@router.delete("/recruiter/candidates/{candidate_id}")
+def delete_candidate(candidate_id: str, user: dict = Depends(require_recruiter)):
+    """
+    Deletes a candidate with their applications and resume files, then removes
+    their points from the vector index (in the worker) so they stop appearing
+    in match and talent search results.
+    """
+    db = appwrite_service.get_database()
+    storage = appwrite_service.get_storage()
+    from appwrite.query import Query
+
+    try:
+        db.get_document(
+            database_id=settings.DATABASE_ID,
+            collection_id=settings.CANDIDATES_COLLECTION_ID,
+            document_id=candidate_id
+        )
+    except Exception:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    # Needs idx_candidate on applications.candidate_id
+    deleted = 0
+    while True:
+        # Deleted documents drop out of the result, so always read the first page
+        documents = db.list_documents(
+            database_id=settings.DATABASE_ID,
+            collection_id=settings.APPLICATIONS_COLLECTION_ID,
+            queries=[Query.equal("candidate_id", candidate_id), Query.limit(100)]
+        )['documents']
+        if not documents:
+            break
+        for doc in documents:
+            try:
+                storage.delete_file(bucket_id=settings.RESUMES_BUCKET_ID, file_id=doc['resume_file_id'])
+            except Exception as e:
+                logger.warning(f"Could not delete resume file {doc.get('resume_file_id')}: {e}")
+            db.delete_document(
+                database_id=settings.DATABASE_ID,
+                collection_id=settings.APPLICATIONS_COLLECTION_ID,
+                document_id=doc['$id']
+            )
+            deleted += 1
+
+    db.delete_document(
+        database_id=settings.DATABASE_ID,
+        collection_id=settings.CANDIDATES_COLLECTION_ID,
+        document_id=candidate_id
+    )
+    queue.enqueue(remove_candidate_from_index, candidate_id)
+    return {"candidate_id": candidate_id, "applications_deleted": deleted}
+
+# --- System ---
+
+@router.get("/system/stats")
+def system_stats(user: dict = Depends(require_recruiter)):
+    try:
+        limiter_stats = gemini_limiter.stats()
+        extraction_stats = parser.stats.stats()
+    except Exception as e:
+        logger.warning(f"Could not read limiter/extraction stats: {e}")
+        limiter_stats = extraction_stats = {"error": str(e)}
+    return {
+        "llm_limiter": limiter_stats,
+        "extraction": extraction_stats,
+        "embedding_cache": embedding_service.cache.stats() if embedding_service.cache else None
+    }
@@ -12,6 +12,19 @@ class Settings:
     # Qdrant
     QDRANT_URL: str = os.getenv("QDRANT_URL", "http://localhost:6333")
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY", "")
+    QDRANT_COLLECTION: str = os.getenv("QDRANT_COLLECTION", "candidates") # Versions are {name}_v{n}; an unversioned {name} is version 0
+    QDRANT_COLLECTION_ALIAS: str = os.getenv("QDRANT_COLLECTION_ALIAS", "candidates_live") # Alias that reads and writes resolve; migrations swap it
+
+    # Dense vector storage and HNSW tuning (applied to existing collections at startup)
+    QDRANT_QUANTIZATION: str = os.getenv("QDRANT_QUANTIZATION", "none") # none, scalar (int8, ~4x less RAM) or binary (~32x, best for 1536-dim)
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "true").lower() == "true"
+    QDRANT_RESCORE: bool = os.getenv("QDRANT_RESCORE", "true").lower() == "true" # Re-rank quantized hits with the original vectors
+    QDRANT_OVERSAMPLING: float = float(os.getenv("QDRANT_OVERSAMPLING", "2.0")) # Quantized candidates fetched per result before rescoring
+    QDRANT_ON_DISK_VECTORS: bool = os.getenv("QDRANT_ON_DISK_VECTORS", "false").lower() == "true" # Keep original vectors on disk (mmap)
+    QDRANT_HNSW_M: int = int(os.getenv("QDRANT_HNSW_M", "16"))
+    QDRANT_HNSW_EF_CONSTRUCT: int = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "100"))
+    QDRANT_SEARCH_EF: int = int(os.getenv("QDRANT_SEARCH_EF", "0")) # Search-time ef; 0 = Qdrant's default
+    VECTOR_MIGRATION_BATCH_SIZE: int = int(os.getenv("VECTOR_MIGRATION_BATCH_SIZE", "64")) # Points re-embedded per scroll page (scripts/migrate_vectors.py)
 
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -19,13 +32,92 @@ class Settings:
     # Embeddings
     EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "mock")
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "32")) # Local model encode batch size
+    OPENAI_EMBEDDING_MAX_INPUTS: int = int(os.getenv("OPENAI_EMBEDDING_MAX_INPUTS", "256")) # Inputs packed per OpenAI request
+    EMBEDDING_CHUNK_CHARS: int = int(os.getenv("EMBEDDING_CHUNK_CHARS", "1000")) # ~256 tokens, the local model's input limit
+
+    # Section-level vectors and match scoring
+    MATCH_AGGREGATION: str = os.getenv("MATCH_AGGREGATION", "weighted") # weighted, max, mean or hybrid (rank fusion with keywords; rank-relative scores)
+    MATCH_SECTION_WEIGHTS: str = os.getenv("MATCH_SECTION_WEIGHTS", "resume:1,experience:1.5,skills:1.5,summary:1,projects:0.5,education:0.5,keywords:1.5")
+    MATCH_RRF_K: int = int(os.getenv("MATCH_RRF_K", "60")) # Rank fusion constant for hybrid search
+
+    # Sparse keyword (BM25) vectors, computed locally
+    SPARSE_BM25_K1: float = float(os.getenv("SPARSE_BM25_K1", "1.2"))
+    SPARSE_BM25_B: float = float(os.getenv("SPARSE_BM25_B", "0.75"))
+    SPARSE_AVG_DOC_TOKENS: float = float(os.getenv("SPARSE_AVG_DOC_TOKENS", "500")) # Typical resume length in tokens
+    MATCH_SECTION_OVERSAMPLE: int = int(os.getenv("MATCH_SECTION_OVERSAMPLE", "3")) # Per-vector candidates fetched = top_k * this
+    MATCH_DEFAULT_LIMIT: int = int(os.getenv("MATCH_DEFAULT_LIMIT", "50")) # Page size when the request gives none
+    MATCH_MAX_LIMIT: int = int(os.getenv("MATCH_MAX_LIMIT", "200"))
+    MATCH_MAX_OFFSET: int = int(os.getenv("MATCH_MAX_OFFSET", "1000")) # Deepest page start; search cost grows with offset + limit
+    MATCH_RANK_WINDOW: int = int(os.getenv("MATCH_RANK_WINDOW", "200")) # Results ranked (and cached) per search; pages are sliced from it
+
+    # Cross-job talent search (one result per person)
+    TALENT_SEARCH_DEFAULT_LIMIT: int = int(os.getenv("TALENT_SEARCH_DEFAULT_LIMIT", "20"))
+    TALENT_SEARCH_MAX_LIMIT: int = int(os.getenv("TALENT_SEARCH_MAX_LIMIT", "100"))
+    TALENT_SEARCH_OVERSAMPLE: int = int(os.getenv("TALENT_SEARCH_OVERSAMPLE", "3")) # Extra prefetch for people with several applications
+
+    # Match-result cache (per-job version counter bumped by the worker)
+    MATCH_CACHE_ENABLED: bool = os.getenv("MATCH_CACHE_ENABLED", "true").lower() == "true"
+    MATCH_CACHE_TTL_SECONDS: int = int(os.getenv("MATCH_CACHE_TTL_SECONDS", "86400"))
+
+    # Embedding cache (in-process LRU in front of a shared Redis tier)
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "2048"))
+    EMBEDDING_CACHE_LOCAL_TTL_SECONDS: int = int(os.getenv("EMBEDDING_CACHE_LOCAL_TTL_SECONDS", "600"))
+    EMBEDDING_CACHE_REDIS_TTL_SECONDS: int = int(os.getenv("EMBEDDING_CACHE_REDIS_TTL_SECONDS", "604800"))
+
+    # Gemini rate limiting (shared by all workers through Redis)
+    GEMINI_RPM: int = int(os.getenv("GEMINI_RPM", "60")) # Requests per minute, 0 = unlimited
+    GEMINI_TPM: int = int(os.getenv("GEMINI_TPM", "1000000")) # Tokens per minute, 0 = unlimited
+    GEMINI_MAX_INFLIGHT: int = int(os.getenv("GEMINI_MAX_INFLIGHT", "4")) # 0 = unlimited
+    GEMINI_EXPECTED_OUTPUT_TOKENS: int = int(os.getenv("GEMINI_EXPECTED_OUTPUT_TOKENS", "512"))
+    LLM_LIMITER_LEASE_SECONDS: int = int(os.getenv("LLM_LIMITER_LEASE_SECONDS", "120")) # Frees slots of crashed workers
+    LLM_LIMITER_MAX_WAIT_SECONDS: float = float(os.getenv("LLM_LIMITER_MAX_WAIT_SECONDS", "300"))
+
+    # Confidence-tiered extraction (LLM only for low-confidence fields)
+    LLM_TIERED_EXTRACTION: bool = os.getenv("LLM_TIERED_EXTRACTION", "true").lower() == "true"
+    LLM_CONFIDENCE_THRESHOLD: float = float(os.getenv("LLM_CONFIDENCE_THRESHOLD", "0.7"))
+
+    # Section-targeted prompt trimming
+    LLM_PROMPT_TOKEN_BUDGET: int = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "3000")) # Resume tokens sent per document
+
+    # Batched LLM extraction (several resumes per Gemini call)
+    LLM_BATCH_TOKEN_BUDGET: int = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "24000")) # Input tokens per batched prompt
+    LLM_BATCH_MAX_DOCS: int = int(os.getenv("LLM_BATCH_MAX_DOCS", "8"))
+
+    # PDF text extraction
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "20"))
+    PDF_MAX_CHARS: int = int(os.getenv("PDF_MAX_CHARS", "60000"))
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "12")) # Use the process pool from this many pages
+    PDF_EXTRACT_PROCESSES: int = int(os.getenv("PDF_EXTRACT_PROCESSES", "2")) # Processes per large PDF (pool lives for one extraction)
+    PDF_SLOW_PAGE_SECONDS: float = float(os.getenv("PDF_SLOW_PAGE_SECONDS", "2"))
+
+    # Parse-result cache (keyed by resume file SHA-256)
+    PARSE_CACHE_ENABLED: bool = os.getenv("PARSE_CACHE_ENABLED", "true").lower() == "true"
+    PARSE_CACHE_TTL_SECONDS: int = int(os.getenv("PARSE_CACHE_TTL_SECONDS", "2592000"))
+    PARSE_CACHE_VERSION: str = os.getenv("PARSE_CACHE_VERSION", "1") # Bump to invalidate after parser changes
+
+    # Skills taxonomy used by the deterministic skill matcher ({"Canonical": ["alias", ...]})
+    SKILLS_TAXONOMY_PATH: str = os.getenv(
+        "SKILLS_TAXONOMY_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills_taxonomy.json")
+    )
 
     # Worker
     WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "4"))
+    WORKER_BATCH_SIZE: int = int(os.getenv("WORKER_BATCH_SIZE", "16")) # Applications per batch job
+    ENQUEUE_PIPELINE_SIZE: int = int(os.getenv("ENQUEUE_PIPELINE_SIZE", "500")) # Jobs per pipelined Redis round trip
+    BATCH_TRACKING_TTL_SECONDS: int = int(os.getenv("BATCH_TRACKING_TTL_SECONDS", "604800"))
+    WORKER_MICRO_BATCH_SIZE: int = int(os.getenv("WORKER_MICRO_BATCH_SIZE", "16"))
+    WORKER_MICRO_BATCH_WAIT_SECONDS: float = float(os.getenv("WORKER_MICRO_BATCH_WAIT_SECONDS", "2"))
 
     # Uploads
     MAX_RESUME_FILE_SIZE_MB: int = int(os.getenv("MAX_RESUME_FILE_SIZE_MB", "10"))
     ALLOWED_RESUME_TYPES: list = os.getenv("ALLOWED_RESUME_TYPES", "pdf,docx,txt").split(",")
+    ARCHIVE_MAX_ENTRIES: int = int(os.getenv("ARCHIVE_MAX_ENTRIES", "10000"))
+    ARCHIVE_MAX_TOTAL_UNCOMPRESSED_MB: int = int(os.getenv("ARCHIVE_MAX_TOTAL_UNCOMPRESSED_MB", "4096"))
+    ARCHIVE_MAX_COMPRESSION_RATIO: int = int(os.getenv("ARCHIVE_MAX_COMPRESSION_RATIO", "100")) # Zip bomb guard
+    BATCH_UPLOAD_CONCURRENCY: int = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", "8")) # Files ingested in parallel per batch
     
     # Collections (Hardcoded or could be envs)
     DATABASE_ID: str = "default" # Or use env if needed
@@ -0,0 +1,6 @@
+from redis import Redis
+from .config import settings
+
+# Shared connection for the API and worker processes.
+# Redis.from_url is lazy, so importing this never blocks on the network.
+redis_conn = Redis.from_url(settings.REDIS_URL)
@@ -3,6 +3,7 @@ from .core.logging_config import setup_logging
 import logging
 
 from .api import router
+from .services.vector_store import vector_store
 
 app = FastAPI(title="Resume Screening MVP v2")
 
@@ -12,6 +13,11 @@ app.include_router(router)
 def on_startup():
     setup_logging()
     logging.info("Application starting up (v2 - Appwrite + Qdrant)...")
+    try:
+        # Filters on job_id, skills and experience rely on these; creates any that are missing
+        vector_store.ensure_payload_indexes()
+    except Exception as e:
+        logging.error(f"Failed to verify Qdrant payload indexes: {e}")
 
 @app.get("/health")
 def health_check():
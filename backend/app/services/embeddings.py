@@ -1,43 +1,221 @@
 import logging
 import os
-from typing import List
+import time
+import hashlib
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, List
 import openai
 from ..core.config import settings
+from ..core.redis_client import redis_conn
 
 logger = logging.getLogger(__name__)
 
+OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"
+LOCAL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache keyed by (provider, model, SHA-256 of normalized text).
+    An in-process LRU tier sits in front of a Redis tier shared by the API and workers.
+    """
+    KEY_PREFIX = "emb"
+
+    def __init__(self, redis_client=None, max_entries: int = 2048,
+                 local_ttl_seconds: int = 600, redis_ttl_seconds: int = 604800):
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.local_ttl_seconds = local_ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._local: "OrderedDict[str, tuple]" = OrderedDict() # key -> (expires_at, vector)
+        self._lock = threading.Lock()
+        self.counters = {"local_hits": 0, "redis_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        # Whitespace/unicode normalization only; case can matter to the model
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def make_key(self, provider: str, model: str, text: str) -> str:
+        digest = hashlib.sha256(self.normalize(text).encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{provider}:{model}:{digest}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._local.get(key)
+                if entry and entry[0] > now:
+                    self._local.move_to_end(key)
+                    found[key] = entry[1]
+                    self.counters["local_hits"] += 1
+                else:
+                    if entry:
+                        del self._local[key]
+                    missing.append(key)
+
+        if missing and self.redis is not None:
+            try:
+                values = self.redis.mget(missing)
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis lookup failed: {e}")
+                values = [None] * len(missing)
+            promoted = {}
+            for key, value in zip(missing, values):
+                if value is not None:
+                    promoted[key] = array("f", value).tolist()
+            if promoted:
+                found.update(promoted)
+                self._set_local(promoted)
+
+        with self._lock:
+            self.counters["redis_hits"] += len(found) - (len(keys) - len(missing))
+            self.counters["misses"] += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]):
+        items = {k: v for k, v in items.items() if v}
+        if not items:
+            return
+        self._set_local(items)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for key, vector in items.items():
+                    pipe.set(key, array("f", vector).tobytes(), ex=self.redis_ttl_seconds)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis write failed: {e}")
+
+    def _set_local(self, items: Dict[str, List[float]]):
+        expires_at = time.monotonic() + self.local_ttl_seconds
+        with self._lock:
+            for key, vector in items.items():
+                self._local[key] = (expires_at, vector)
+                self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.counters["local_hits"] + self.counters["redis_hits"] + self.counters["misses"]
+            hits = lookups - self.counters["misses"]
+            return {
+                **self.counters,
+                "local_entries": len(self._local),
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
 class EmbeddingService:
     def __init__(self):
         self.provider = settings.EMBEDDING_PROVIDER
         self.model = None
-        
-        if self.provider == "openai" and settings.OPENAI_API_KEY:
+        self.cache = None
+        if settings.EMBEDDING_CACHE_ENABLED:
+            self.cache = EmbeddingCache(
+                redis_client=redis_conn,
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+                local_ttl_seconds=settings.EMBEDDING_CACHE_LOCAL_TTL_SECONDS,
+                redis_ttl_seconds=settings.EMBEDDING_CACHE_REDIS_TTL_SECONDS
+            )
+
+        if self._use_openai():
             openai.api_key = settings.OPENAI_API_KEY
+            self.model_name = OPENAI_EMBEDDING_MODEL
             logger.info("Using OpenAI embeddings.")
         else:
             logger.info("Using Local SentenceTransformer embeddings.")
             from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model_name = LOCAL_EMBEDDING_MODEL
+            self.model = SentenceTransformer(LOCAL_EMBEDDING_MODEL)
+
+    def _use_openai(self) -> bool:
+        return self.provider == "openai" and bool(settings.OPENAI_API_KEY)
 
     def generate_embedding(self, text: str) -> List[float]:
         if not text:
             return []
-            
+        return self.generate_embeddings([text])[0]
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds a list of texts in as few model/API calls as possible, serving
+        repeats from the cache. Output order matches input order; empty or
+        failed inputs map to [].
+        """
+        results: List[List[float]] = [[] for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text]
+        if not indices:
+            return results
+
+        keys = {}
+        if self.cache:
+            provider = "openai" if self._use_openai() else "local"
+            keys = {i: self.cache.make_key(provider, self.model_name, texts[i]) for i in indices}
+            cached = self.cache.get_many(list(set(keys.values())))
+            for i in indices:
+                if keys[i] in cached:
+                    results[i] = cached[keys[i]]
+            indices = [i for i in indices if not results[i]]
+            if not indices:
+                return results
+
+        self._embed_into(texts, indices, results)
+
+        if self.cache:
+            self.cache.set_many({keys[i]: results[i] for i in indices})
+
+        return results
+
+    def generate_pooled_embeddings(self, groups: List[Dict[str, List[str]]]) -> List[Dict[str, List[float]]]:
+        """
+        Embeds named groups of text chunks (e.g. resume sections) for many documents
+        in one batched call and mean-pools each group into a single vector.
+        Groups whose chunks all failed to embed are left out.
+        """
+        unique_texts = list({text for group in groups for chunks in group.values() for text in chunks})
+        vectors = dict(zip(unique_texts, self.generate_embeddings(unique_texts)))
+
+        pooled = []
+        for group in groups:
+            doc_vectors = {}
+            for name, chunks in group.items():
+                chunk_vectors = [vectors[text] for text in chunks if vectors.get(text)]
+                if chunk_vectors:
+                    doc_vectors[name] = [sum(column) / len(chunk_vectors) for column in zip(*chunk_vectors)]
+            pooled.append(doc_vectors)
+        return pooled
+
+    def _embed_into(self, texts: List[str], indices: List[int], results: List[List[float]]):
         try:
-            if self.provider == "openai" and settings.OPENAI_API_KEY:
-                text = text.replace("\n", " ")
-                return openai.Embedding.create(input=[text], model="text-embedding-ada-002")['data'][0]['embedding']
-            else:
-                if self.model:
-                     embedding = self.model.encode(text)
-                     return embedding.tolist()
-                return []
+            if self._use_openai():
+                # One request carries up to OPENAI_EMBEDDING_MAX_INPUTS texts
+                step = max(1, settings.OPENAI_EMBEDDING_MAX_INPUTS)
+                for start in range(0, len(indices), step):
+                    chunk = indices[start:start + step]
+                    response = openai.Embedding.create(
+                        input=[texts[i].replace("\n", " ") for i in chunk],
+                        model=self.model_name
+                    )
+                    for item in response['data']:
+                        results[chunk[item['index']]] = item['embedding']
+            elif self.model:
+                embeddings = self.model.encode(
+                    [texts[i] for i in indices],
+                    batch_size=max(1, settings.EMBEDDING_BATCH_SIZE)
+                )
+                for i, embedding in zip(indices, embeddings):
+                    results[i] = embedding.tolist()
         except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
-            return []
+            logger.error(f"Error generating embeddings for {len(indices)} texts: {e}")
 
     def get_dimension(self) -> int:
-        if self.provider == "openai" and settings.OPENAI_API_KEY:
+        if self._use_openai():
             return 1536
         return 384
 
@@ -1,30 +1,116 @@
+import io
 import os
-import re
 import json
+import time
 import logging
+from datetime import date
+from concurrent.futures import Executor
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-from typing import Dict, List, Optional, Any
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 
 load_dotenv('backend/.env')
-from pypdf import PdfReader
 from docx import Document
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from .pdf_extract import extract_pdf_text
+from .rate_limiter import gemini_limiter, estimate_tokens
+from .sections import SECTION_HEADERS, build_prompt_text, segment_sections
+from .skills import skill_matcher
+from .text_scan import DEGREE_PATTERN, SENTENCE_SPLIT_PATTERN, clean_text, find_date_ranges, scan_basics
+from ..core.config import settings
+from ..core.redis_client import redis_conn
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Constants
-SECTION_HEADERS = {
-    "skills": ["skills", "technical skills", "core competencies"],
-    "experience": ["experience", "work experience", "employment"],
-    "education": ["education", "academic"],
-    "projects": ["projects"],
-    "summary": ["about me", "summary", "profile"]
+# Structured fields extracted per resume, with the description given to the LLM
+FIELD_DESCRIPTIONS = {
+    "name": "Full name of the candidate.",
+    "skills": "List[str] of technical skills, languages, tools.",
+    "experience_years": "Float estimate of total years of experience.",
+    "summary": "A concise 2-sentence professional summary of the candidate.",
+    "education": "List of degrees/universities.",
 }
 
+# Sections worth sending when the LLM only has to fill in some fields
+FIELD_SECTIONS = {
+    "name": ["header"],
+    "skills": ["skills", "experience", "projects"],
+    "experience_years": ["experience"],
+    "summary": ["summary", "experience", "skills"],
+    "education": ["education"],
+}
+
+def _key_lines(fields: List[str]) -> str:
+    return "\n".join(f"- {field}: {FIELD_DESCRIPTIONS[field]}" for field in fields)
+
+def _prompt_sections(fields: List[str]) -> Optional[List[str]]:
+    """Sections to send when only `fields` are requested; None sends the whole resume."""
+    if len(fields) >= len(FIELD_DESCRIPTIONS):
+        return None
+    return sorted({section for field in fields for section in FIELD_SECTIONS[field]} | {"header"})
+
+def _experience_years(date_ranges) -> float:
+    """Years covered by (start, end or "present") ranges; overlapping ranges are counted once."""
+    current_year = date.today().year
+    spans = sorted(
+        (int(start), current_year if end == "present" else int(end))
+        for start, end in date_ranges
+    )
+    total, span_start, span_end = 0, None, None
+    for start, end in spans:
+        if end < start:
+            continue
+        if span_end is not None and start <= span_end:
+            span_end = max(span_end, end)
+            continue
+        if span_end is not None:
+            total += span_end - span_start
+        span_start, span_end = start, end
+    if span_end is not None:
+        total += span_end - span_start
+    return float(total)
+
+class ExtractionStats:
+    """
+    Routing and latency counters for structured extraction, kept in a Redis hash
+    so numbers from every worker process add up. Best effort: failures are ignored.
+    """
+    KEY = "parser:extraction_stats"
+
+    def __init__(self, redis_client=None):
+        self.redis = redis_client
+
+    def record(self, route: str, deterministic_seconds: float, llm_seconds: float = 0.0, llm_fields: List[str] = ()):
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hincrby(self.KEY, "documents", 1)
+            pipe.hincrby(self.KEY, f"route:{route}", 1)
+            pipe.hincrbyfloat(self.KEY, "deterministic_seconds", deterministic_seconds)
+            if llm_seconds:
+                pipe.hincrbyfloat(self.KEY, "llm_seconds", llm_seconds)
+                pipe.hincrby(self.KEY, "llm_calls", 1)
+            for field in llm_fields:
+                pipe.hincrby(self.KEY, f"llm_field:{field}", 1)
+            pipe.execute()
+        except Exception as e:
+            logger.debug(f"Could not record extraction stats: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        counters = {k.decode(): float(v) for k, v in self.redis.hgetall(self.KEY).items()}
+        documents = counters.get("documents", 0)
+        llm_calls = counters.get("llm_calls", 0)
+        return {
+            **counters,
+            "llm_skip_rate": round(counters.get("route:deterministic", 0) / documents, 4) if documents else 0.0,
+            "avg_deterministic_ms": round(1000 * counters.get("deterministic_seconds", 0) / documents, 2) if documents else 0.0,
+            "avg_llm_call_ms": round(1000 * counters.get("llm_seconds", 0) / llm_calls, 2) if llm_calls else 0.0
+        }
+
 class ResumeParser:
     def __init__(self):
         api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
@@ -34,40 +120,172 @@ class ResumeParser:
         else:
             logger.warning("No Gemini API Key found. Falling back to Regex-only mode.")
             self.has_llm = False
+        self.stats = ExtractionStats(redis_conn)
 
-    def parse(self, file_path: str) -> Dict[str, Any]:
+    def parse(self, source: Union[str, bytes, BinaryIO], filename: Optional[str] = None) -> Dict[str, Any]:
         """
         Main entry point for parsing.
+        `source` is a file path, raw bytes or a binary file-like object (e.g. a
+        SpooledTemporaryFile). For bytes/streams pass `filename` so the format
+        can be detected from its extension.
         """
         try:
-            logger.info(f"Starting resume parsing for: {file_path}")
-            raw_text = self._extract_text(file_path)
+            clean_text = self._read_text(source, filename)
         except Exception as e:
             logger.error(f"Text extraction failed: {e}")
             return {"error": f"Failed to read file: {str(e)}"}
 
-        clean_text = self._clean_text(raw_text)
+        llm_data, extraction_method = self._extract_structured(clean_text)
+        return self._build_result(clean_text, llm_data, extraction_method)
+
+    def parse_batch(self, items: List[Tuple[str, Union[str, bytes, BinaryIO], Optional[str]]],
+                    executor: Optional[Executor] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Parses several resumes, packing them into as few LLM calls as possible.
+        `items` are (doc_id, source, filename) tuples; returns {doc_id: result}
+        with the same shape as parse(). Documents the batched call fails to
+        return valid data for fall back to a single-resume call.
+        Only the LLM call is batched: with an `executor`, text extraction, the
+        deterministic tier, the batched calls and the fallbacks run on its threads.
+        """
+        run = executor.map if executor is not None else map
+        results = {}
+        texts = {}
+        pending = {}
+
+        # Tier 1: text extraction and deterministic extraction; only documents with
+        # low-confidence fields go on to the LLM
+        for (doc_id, _, _), outcome in zip(items, run(lambda item: self._read_and_tier(item[1], item[2]), items)):
+            if "error" in outcome:
+                logger.error(f"Text extraction failed for {doc_id}: {outcome['error']}")
+                results[doc_id] = {"error": f"Failed to read file: {outcome['error']}"}
+                continue
+            clean_text = outcome["text"]
+            texts[doc_id] = clean_text
+            if not outcome["low_fields"]:
+                self.stats.record("deterministic", outcome["seconds"])
+                results[doc_id] = self._build_result(clean_text, outcome["data"], "deterministic")
+            else:
+                pending[doc_id] = (outcome["data"], outcome["low_fields"], outcome["seconds"])
+
+        # Tier 2: batched LLM calls for the rest
+        extracted = {}
+        if self.has_llm and len(pending) > 1:
+            # Documents needing the same fields share a prompt that asks only for those
+            # fields and sends only their sections, as in the single-resume path
+            by_fields = {}
+            for doc_id, (_, low_fields, _) in pending.items():
+                by_fields.setdefault(tuple(low_fields), []).append(doc_id)
+            groups = [
+                (group, list(fields))
+                for fields, doc_ids in by_fields.items()
+                for group in self._pack_batches({doc_id: texts[doc_id] for doc_id in doc_ids}, list(fields))
+                if len(group) >= 2 # A lone document gains nothing from the batch prompt
+            ]
+            outcomes = run(lambda group: self._extract_group(group[0], group[1], texts), groups)
+            for (group, _), (group_extracted, elapsed) in zip(groups, outcomes):
+                extracted.update(group_extracted)
+                for doc_id in group:
+                    if doc_id in group_extracted:
+                        data, low_fields, det_seconds = pending[doc_id]
+                        route = "llm" if data is None or len(low_fields) == len(FIELD_DESCRIPTIONS) else "tiered"
+                        self.stats.record(f"{route}_batched", det_seconds, elapsed, low_fields)
+            logger.info(f"Batched LLM extraction returned valid data for {len(extracted)}/{len(pending)} resumes")
+
+        def finish(doc_id):
+            data, low_fields, _ = pending[doc_id]
+            clean_text = texts[doc_id]
+            if doc_id not in extracted:
+                llm_data, extraction_method = self._extract_structured(clean_text)
+                return self._build_result(clean_text, llm_data, extraction_method)
+            if data is None or len(low_fields) == len(FIELD_DESCRIPTIONS):
+                return self._build_result(clean_text, extracted[doc_id], "llm")
+            data.update({field: extracted[doc_id][field] for field in low_fields})
+            return self._build_result(clean_text, data, "tiered")
+
+        results.update(zip(pending, run(finish, list(pending))))
+        return results
+
+    def _read_and_tier(self, source: Union[str, bytes, BinaryIO], filename: Optional[str]) -> Dict[str, Any]:
+        """Text plus deterministic fields for parse_batch; low_fields is None when the LLM gets every field."""
+        try:
+            clean_text = self._read_text(source, filename)
+        except Exception as e:
+            return {"error": str(e)}
+        if not (self.has_llm and settings.LLM_TIERED_EXTRACTION):
+            return {"text": clean_text, "data": None, "low_fields": list(FIELD_DESCRIPTIONS), "seconds": 0.0}
+        start = time.perf_counter()
+        data, low_fields = self._extract_tiered_deterministic(clean_text)
+        return {"text": clean_text, "data": data, "low_fields": low_fields, "seconds": time.perf_counter() - start}
+
+    def _extract_group(self, group: List[str], fields: List[str], texts: Dict[str, str]) -> Tuple[Dict[str, Dict[str, Any]], float]:
+        """One batched LLM call; returns (extracted, seconds per document). Failures return nothing."""
+        start = time.perf_counter()
+        try:
+            extracted = self._extract_with_gemini_batch({doc_id: texts[doc_id] for doc_id in group}, fields)
+        except Exception as e:
+            logger.error(f"Batched Gemini extraction failed for {len(group)} resumes: {e}")
+            extracted = {}
+        return extracted, (time.perf_counter() - start) / len(group)
+
+    def _read_text(self, source: Union[str, bytes, BinaryIO], filename: Optional[str] = None) -> str:
+        label = filename or (source if isinstance(source, str) else "<in-memory>")
+        logger.info(f"Starting resume parsing for: {label}")
+        clean_text = self._clean_text(self._extract_text(source, filename))
         logger.info(f"Text extracted successfully ({len(clean_text)} chars). Proceeding to structured extraction.")
-        
+        return clean_text
+
+    def _extract_structured(self, clean_text: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Returns (fields, extraction_method). With tiered extraction on, deterministic
+        parsing runs first and the LLM is only asked for fields whose confidence is
+        below LLM_CONFIDENCE_THRESHOLD ("deterministic" when it is skipped entirely,
+        "tiered" for a partial call, "llm" when every field needed it).
+        """
+        if not self.has_llm:
+            return self._extract_regex_fallback(clean_text), "regex"
+
+        fields = list(FIELD_DESCRIPTIONS)
+        data = {}
+        start = time.perf_counter()
+        if settings.LLM_TIERED_EXTRACTION:
+            data, fields = self._extract_tiered_deterministic(clean_text)
+        deterministic_seconds = time.perf_counter() - start
+        if not fields:
+            self.stats.record("deterministic", deterministic_seconds)
+            return data, "deterministic"
+
+        route = "llm" if len(fields) == len(FIELD_DESCRIPTIONS) else "tiered"
+        # Layer 2: LLM Extraction (with fallback)
+        start = time.perf_counter()
+        try:
+            llm_data = self._extract_with_gemini(clean_text, fields)
+        except Exception as e:
+            logger.error(f"Gemini extraction failed: {e}")
+            self.stats.record("llm_failed", deterministic_seconds, time.perf_counter() - start, fields)
+            # Fallback to regex logic if LLM fails
+            return self._extract_regex_fallback(clean_text), "regex"
+
+        self.stats.record(route, deterministic_seconds, time.perf_counter() - start, fields)
+        data.update({field: llm_data[field] for field in fields})
+        return data, route
+
+    def _extract_tiered_deterministic(self, clean_text: str) -> Tuple[Dict[str, Any], List[str]]:
+        """Runs deterministic extraction and returns (fields, names of fields below the confidence threshold)."""
+        data, confidence = self._extract_deterministic(clean_text)
+        low_fields = [field for field in FIELD_DESCRIPTIONS if confidence.get(field, 0.0) < settings.LLM_CONFIDENCE_THRESHOLD]
+        logger.info(f"Deterministic confidence: {confidence}; LLM needed for: {low_fields or 'nothing'}")
+        return data, low_fields
+
+    def _build_result(self, clean_text: str, llm_data: Dict[str, Any], extraction_method: str) -> Dict[str, Any]:
         # Layer 1: Deterministic Regex (Always run these)
+        scanned = scan_basics(clean_text)
         basics = {
-            "email": self._extract_email(clean_text),
-            "phone": self._extract_phone(clean_text),
-            "links": self._extract_links(clean_text)
+            "email": scanned.email,
+            "phone": scanned.phone,
+            "links": list(scanned.links)
         }
 
-        # Layer 2: LLM Extraction (with fallback)
-        llm_data = {}
-        if self.has_llm:
-            try:
-                llm_data = self._extract_with_gemini(clean_text)
-            except Exception as e:
-                logger.error(f"Gemini extraction failed: {e}")
-                # Fallback to regex logic if LLM fails
-                llm_data = self._extract_regex_fallback(clean_text)
-        else:
-            llm_data = self._extract_regex_fallback(clean_text)
-
         # Merge results (LLM overwrites Regex fallback, but Regex basics persist)
         # Note: If LLM returns None for email/phone, we prefer Regex result usually, 
         # but here we separate "basics" (reliable regex) vs "content" (LLM/Regex).
@@ -75,6 +293,7 @@ class ResumeParser:
         # Consolidate
         result = {**basics, **llm_data}
         result["raw_text"] = clean_text # Store raw text for search/debugging
+        result["extraction_method"] = extraction_method
         '''
         result contains the following
         - email
@@ -86,81 +305,212 @@ class ResumeParser:
         - summary: A concise 2-sentence professional summary of the candidate.
         - education: List of degrees/universities.
         - raw_text
+        - extraction_method: "llm", "tiered" (LLM filled low-confidence fields only),
+          "deterministic" (LLM skipped) or "regex" (LLM off or failed)
         '''
         
         return result
 
-    def _extract_text(self, file_path: str) -> str:
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(file_path)
+    def _extract_text(self, source: Union[str, bytes, BinaryIO], filename: Optional[str] = None) -> str:
+        if isinstance(source, str):
+            if not os.path.exists(source):
+                raise FileNotFoundError(source)
+            filename = filename or source
+            with open(source, "rb") as f:
+                return self._extract_text(f, filename)
 
-        ext = os.path.splitext(file_path)[1].lower()
+        # PDF and DOCX readers both accept seekable binary streams, so nothing touches disk
+        stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        ext = os.path.splitext(filename or "")[1].lower()
         if ext == ".pdf":
-            text = ""
-            try:
-                reader = PdfReader(file_path)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            except Exception:
-                pass # Simple fallback
-            return text
-        elif ext in [".docx", ".doc"]:
-            doc = Document(file_path)
+            return extract_pdf_text(stream, label=filename)
+        elif ext == ".docx":
+            doc = Document(stream)
             return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+        elif ext == ".txt":
+            return stream.read().decode("utf-8", errors="replace")
         else:
             raise ValueError(f"Unsupported file type: {ext}")
 
     def _clean_text(self, text: str) -> str:
-        text = text.replace("\t", " ")
-        text = re.sub(r"[•●▪]", "-", text)
-        text = re.sub(r"\n{2,}", "\n\n", text)
-        return text.strip()
+        return clean_text(text)
 
     # --- Layer 1: Regex Basics ---
-    def _extract_email(self, text: str) -> Optional[str]:
-        match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
-        return match.group(0) if match else None
-
-    def _extract_phone(self, text: str) -> Optional[str]:
-        # Broad regex for phone numbers
-        match = re.search(r"(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
-        return match.group(0) if match else None
-
-    def _extract_links(self, text: str) -> List[str]:
-        return re.findall(r"(https?://\S+)", text)
+    # Email, phone, links and date ranges come from one pass of scan_basics (text_scan.py)
 
     # --- Layer 2: Gemini LLM ---
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def _extract_with_gemini(self, text: str) -> Dict[str, Any]:
+    def _extract_with_gemini(self, text: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Extracts structured data using Gemini Flash.
-        Incudes retry logic for Rate Limits (429).
+        Incudes retry logic for Rate Limits (429); calls are paced by the shared Gemini limiter.
+        When `fields` is given, only those keys are requested and only the sections
+        relevant to them are sent, which keeps the prompt small.
         """
+        fields = fields or list(FIELD_DESCRIPTIONS)
+        sections = _prompt_sections(fields)
+
         prompt = f"""
         You are an expert HR Resume Parser. Extract the following information from the resume text below.
         Return ONLY a raw JSON object. Do not use Markdown formatting.
         
         Keys required:
-        - name: Full name of the candidate.
-        - skills: List[str] of technical skills, languages, tools.
-        - experience_years: Float estimate of total years of experience.
-        - summary: A concise 2-sentence professional summary of the candidate.
-        - education: List of degrees/universities.
+        {_key_lines(fields)}
         
         Resume Text:
-        {text[:15000]} 
-        """ 
-        # Truncate to avoid token limits if extremely large, though Flash context is huge.
-
-        response = self.client.models.generate_content(
-            model='gemini-1.5-flash',
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json"
+        {build_prompt_text(text, settings.LLM_PROMPT_TOKEN_BUDGET, sections)}
+        """
+        # Only the relevant sections are sent, trimmed to LLM_PROMPT_TOKEN_BUDGET tokens.
+
+        # Wait for cluster-wide capacity instead of stampeding into 429s
+        with gemini_limiter.acquire(estimate_tokens(prompt) + settings.GEMINI_EXPECTED_OUTPUT_TOKENS):
+            response = self.client.models.generate_content(
+                model='gemini-1.5-flash',
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json"
+                )
             )
-        )
         
-        return json.loads(response.text)
+        validated = self._validate_extraction(json.loads(response.text))
+        if validated is None:
+            raise ValueError("Gemini returned malformed fields")
+        return validated
+
+    def _pack_batches(self, texts: Dict[str, str], fields: Optional[List[str]] = None) -> List[List[str]]:
+        """Greedily groups documents so each batched prompt stays within the token budget."""
+        sections = _prompt_sections(fields or list(FIELD_DESCRIPTIONS))
+        groups, current, used = [], [], 0
+        for doc_id, text in texts.items():
+            cost = estimate_tokens(build_prompt_text(text, settings.LLM_PROMPT_TOKEN_BUDGET, sections))
+            if current and (used + cost > settings.LLM_BATCH_TOKEN_BUDGET or len(current) >= settings.LLM_BATCH_MAX_DOCS):
+                groups.append(current)
+                current, used = [], 0
+            current.append(doc_id)
+            used += cost
+        if current:
+            groups.append(current)
+        return groups
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def _extract_with_gemini_batch(self, texts: Dict[str, str], fields: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Extracts several resumes in one Gemini call. Returns {doc_id: data} for the
+        items that came back valid; missing or malformed items are left out.
+        When `fields` is given, only those keys and their sections are sent.
+        """
+        fields = fields or list(FIELD_DESCRIPTIONS)
+        sections = _prompt_sections(fields)
+        resumes = "\n".join(
+            f'<resume id="{doc_id}">\n{build_prompt_text(text, settings.LLM_PROMPT_TOKEN_BUDGET, sections)}\n</resume>'
+            for doc_id, text in texts.items()
+        )
+        prompt = f"""
+        You are an expert HR Resume Parser. Below are {len(texts)} resumes, each wrapped in <resume id="..."> tags.
+        Extract the following information from EACH resume.
+        Return ONLY a raw JSON array with one object per resume. Do not use Markdown formatting.
+
+        Keys required in every object:
+        - id: The id attribute of the resume the object describes.
+        {_key_lines(fields)}
+
+        Resumes:
+        {resumes}
+        """
+
+        tokens = estimate_tokens(prompt) + settings.GEMINI_EXPECTED_OUTPUT_TOKENS * len(texts)
+        with gemini_limiter.acquire(tokens):
+            response = self.client.models.generate_content(
+                model='gemini-1.5-flash',
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json"
+                )
+            )
+
+        items = json.loads(response.text)
+        if not isinstance(items, list):
+            raise ValueError("Batched extraction did not return a JSON array")
+
+        extracted = {}
+        for item in items:
+            if not isinstance(item, dict) or str(item.get("id")) not in texts:
+                continue
+            validated = self._validate_extraction(item)
+            if validated is not None:
+                extracted[str(item["id"])] = validated
+        return extracted
+
+    def _validate_extraction(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Checks and normalizes one extracted record; returns None if it is unusable."""
+        if not isinstance(item, dict):
+            return None
+        try:
+            name = item.get("name")
+            skills = item.get("skills") or []
+            education = item.get("education") or []
+            summary = item.get("summary") or ""
+            if name is not None and not isinstance(name, str):
+                return None
+            if not isinstance(skills, list) or not isinstance(education, list) or not isinstance(summary, str):
+                return None
+            return {
+                "name": name,
+                "skills": [str(s) for s in skills if s],
+                "experience_years": float(item.get("experience_years") or 0),
+                "summary": summary,
+                "education": education
+            }
+        except (TypeError, ValueError):
+            return None
+
+    # --- Deterministic tier (with per-field confidence) ---
+    def _extract_deterministic(self, text: str) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Regex/section based extraction of every structured field, plus a 0-1
+        confidence score per field used to decide what still needs the LLM.
+        """
+        sections = segment_sections(text)
+        fallback = self._extract_regex_fallback(text)
+        confidence = {}
+
+        # Name: a short, letters-only first line is very likely the name
+        name = fallback["name"]
+        words = name.split()
+        looks_like_name = 2 <= len(words) <= 4 and all(w.replace("-", "").replace("'", "").replace(".", "").isalpha() for w in words)
+        confidence["name"] = 0.9 if looks_like_name else 0.2
+
+        # Skills: trustworthy when there is an explicit skills section with several hits
+        skills = fallback["skills"]
+        if len(skills) >= 3:
+            confidence["skills"] = 0.85 if "skills" in sections else 0.6
+        else:
+            confidence["skills"] = 0.2
+
+        # Experience: date ranges inside an experience section only (education dates
+        # would inflate it); without any, leave the field to the LLM
+        date_ranges = find_date_ranges(sections.get("experience", ""))
+        confidence["experience_years"] = 0.8 if date_ranges else 0.0
+
+        # Education: degree-like lines in the education section
+        education = [
+            line.strip(" -") for line in sections.get("education", "").split("\n")
+            if line.strip() and DEGREE_PATTERN.search(line)
+        ][:5]
+        confidence["education"] = 0.8 if education else 0.2
+
+        # Summary: first two sentences of an explicit summary section
+        summary = " ".join(SENTENCE_SPLIT_PATTERN.split(sections.get("summary", "").replace("\n", " "))[:2]).strip()
+        confidence["summary"] = 0.8 if len(summary) >= 40 else 0.0
+
+        data = {
+            "name": name,
+            "skills": skills,
+            "experience_years": _experience_years(date_ranges),
+            "summary": summary or fallback["summary"],
+            "education": education
+        }
+        return data, confidence
 
     # --- Layer 3: Regex Fallback (From original gpt_parser) ---
     def _extract_regex_fallback(self, text: str) -> Dict[str, Any]:
@@ -170,26 +520,15 @@ class ResumeParser:
         lines = [l for l in text.split('\n') if l.strip()]
         name = lines[0].strip() if lines else "Unknown"
         
-        # Experience Years (Simple date math)
-        years = []
-        for match in re.findall(r"(20\d{2})\s*-\s*(present|20\d{2})", text.lower()):
-            start = int(match[0])
-            end = 2024 if match[1] == "present" else int(match[1]) # Hardcoded 2024 for safety
-            years.append(end - start)
-        total_exp = round(sum(years), 1) if years else 0.0
+        # Experience Years (date ranges, overlaps merged, "present" is the current year)
+        total_exp = _experience_years(scan_basics(text).date_ranges)
         
-        # Skills (Simple Keyword Match)
-        # We can implement a larger list here if needed, or use the one from known skills
-        known_skills = {
-            "python", "sql", "javascript", "react", "java", "c++", "aws", "docker", 
-            "kubernetes", "machine learning", "pytorch", "tensorflow", "git"
-        }
-        text_lower = text.lower()
-        found_skills = [s for s in known_skills if s in text_lower]
+        # Skills (single pass over the text against the full taxonomy)
+        found_skills = skill_matcher.find(text)
         
         return {
             "name": name,
-            "skills": sorted(found_skills),
+            "skills": found_skills,
             "experience_years": total_exp,
             "summary": "Extracted via Regex (LLM unavailable).",
             "education": [] 
@@ -0,0 +1,79 @@
+import json
+import logging
+from typing import Any, Iterable, List, Optional, Tuple
+from ..core.config import settings
+from ..core.redis_client import redis_conn
+
+logger = logging.getLogger(__name__)
+
+class MatchResultCache:
+    """
+    Caches ranked match results per job under a per-job version counter.
+    The worker bumps the version whenever an application for the job is indexed
+    or removed, so a cached ranking is only served while it is still current.
+    Version and entry are fetched in one round trip; entries from an older
+    version are ignored and simply expire.
+    """
+    KEY_PREFIX = "match"
+
+    def __init__(self, redis_client=None, ttl_seconds: int = 86400):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    def _version_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}:version"
+
+    def _entry_key(self, job_id: str, variant: str) -> str:
+        # `variant` covers the request parameters that change the ranking
+        return f"{self.KEY_PREFIX}:{job_id}:result:{variant}"
+
+    def get(self, job_id: str, variant: str) -> Tuple[Optional[List[Any]], Optional[int]]:
+        """
+        Returns (cached results or None, current version). Pass the version back to
+        set(): it was read before the search, so a ranking computed while the worker
+        bumped the version is stored under the old one and never served.
+        """
+        if self.redis is None:
+            return None, None
+        try:
+            version, entry = self.redis.mget(self._version_key(job_id), self._entry_key(job_id, variant))
+        except Exception as e:
+            logger.warning(f"Match cache lookup failed: {e}")
+            return None, None
+        version = int(version or 0)
+        if entry is None:
+            return None, version
+        entry = json.loads(entry)
+        if entry["version"] != version:
+            return None, version
+        return entry["results"], version
+
+    def set(self, job_id: str, variant: str, version: Optional[int], results: List[Any]):
+        if self.redis is None or version is None:
+            return
+        try:
+            self.redis.set(
+                self._entry_key(job_id, variant),
+                json.dumps({"version": version, "results": results}),
+                ex=self.ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Match cache write failed: {e}")
+
+    def invalidate(self, job_ids: Iterable[str]):
+        """Bumps the version of every job whose candidate pool changed."""
+        job_ids = set(job_ids)
+        if self.redis is None or not job_ids:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for job_id in job_ids:
+                pipe.incr(self._version_key(job_id))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Match cache invalidation failed for jobs {sorted(job_ids)}: {e}")
+
+match_cache = MatchResultCache(
+    redis_client=redis_conn if settings.MATCH_CACHE_ENABLED else None,
+    ttl_seconds=settings.MATCH_CACHE_TTL_SECONDS
+)
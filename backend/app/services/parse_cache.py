@@ -0,0 +1,53 @@
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+from ..core.config import settings
+from ..core.redis_client import redis_conn
+
+logger = logging.getLogger(__name__)
+
+class ParseResultCache:
+    """
+    Persists parser output (structured fields + extracted text) keyed by the
+    SHA-256 of the resume file bytes, so identical uploads are parsed once.
+    """
+    KEY_PREFIX = "parse"
+
+    def __init__(self, redis_client=None, ttl_seconds: int = 2592000, version: str = "1"):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _key(self, digest: str, mode: str) -> str:
+        # Mode (llm/regex) is part of the key so a regex-only result never
+        # stands in for an LLM parse once a key is configured.
+        return f"{self.KEY_PREFIX}:v{self.version}:{mode}:{digest}"
+
+    def get(self, digest: str, mode: str) -> Optional[Dict[str, Any]]:
+        if self.redis is None:
+            return None
+        try:
+            value = self.redis.get(self._key(digest, mode))
+        except Exception as e:
+            logger.warning(f"Parse cache lookup failed: {e}")
+            return None
+        return json.loads(value) if value else None
+
+    def set(self, digest: str, mode: str, parsed_data: Dict[str, Any]):
+        if self.redis is None or "error" in parsed_data:
+            return
+        try:
+            self.redis.set(self._key(digest, mode), json.dumps(parsed_data), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Parse cache write failed: {e}")
+
+parse_cache = ParseResultCache(
+    redis_client=redis_conn if settings.PARSE_CACHE_ENABLED else None,
+    ttl_seconds=settings.PARSE_CACHE_TTL_SECONDS,
+    version=settings.PARSE_CACHE_VERSION
+)
@@ -0,0 +1,105 @@
+import io
+import time
+import logging
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, List, Optional, Tuple
+from pypdf import PdfReader
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (page_number, text, seconds, error)
+PageResult = Tuple[int, str, float, Optional[str]]
+
+def _extract_from_reader(reader: PdfReader, page_numbers: List[int], max_chars: int) -> List[PageResult]:
+    """Extracts pages in order, stopping once max_chars characters have been read."""
+    results = []
+    chars = 0
+    for page_number in page_numbers:
+        start = time.perf_counter()
+        try:
+            text = reader.pages[page_number].extract_text() or ""
+            error = None
+        except Exception as e:
+            text, error = "", str(e)
+        results.append((page_number, text, time.perf_counter() - start, error))
+        chars += len(text)
+        if chars >= max_chars:
+            break
+    return results
+
+def _extract_pages(pdf_bytes: bytes, page_numbers: List[int], max_chars: int) -> List[PageResult]:
+    """Process-pool entry point: each process opens its own reader over the raw bytes."""
+    return _extract_from_reader(PdfReader(io.BytesIO(pdf_bytes)), page_numbers, max_chars)
+
+def _split_pages(page_count: int, parts: int) -> List[List[int]]:
+    size = -(-page_count // parts) # ceil
+    return [list(range(i, min(i + size, page_count))) for i in range(0, page_count, size)]
+
+def extract_pdf_text(stream: BinaryIO, label: str = "<pdf>") -> str:
+    """
+    Extracts text from a PDF, capped at PDF_MAX_PAGES pages and PDF_MAX_CHARS characters;
+    extraction stops at the page that reaches PDF_MAX_CHARS. Documents with at least
+    PDF_PARALLEL_MIN_PAGES pages are split across a process pool, smaller ones are
+    extracted inline. The pool lives for one call: RQ's work horse exits with
+    os._exit, so a longer-lived pool would leak its processes.
+    Per-page timings are logged, and pages slower than PDF_SLOW_PAGE_SECONDS are flagged.
+    Raises if the file cannot be opened or no page could be read.
+    """
+    pdf_bytes = stream.read()
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    total_pages = len(reader.pages)
+    page_count = min(total_pages, max(1, settings.PDF_MAX_PAGES))
+    processes = max(1, settings.PDF_EXTRACT_PROCESSES)
+    max_chars = settings.PDF_MAX_CHARS
+
+    start = time.perf_counter()
+    if processes > 1 and page_count >= settings.PDF_PARALLEL_MIN_PAGES:
+        ranges = _split_pages(page_count, processes)
+        # forkserver: forking this process directly is unsafe while the worker's threads run
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=get_context("forkserver")) as pool:
+            futures = [pool.submit(_extract_pages, pdf_bytes, pages, max_chars) for pages in ranges]
+            results = []
+            chars = 0
+            for i, future in enumerate(futures):
+                chunk = future.result()
+                results.extend(chunk)
+                chars += sum(len(text) for _, text, _, _ in chunk)
+                if chars >= max_chars:
+                    # Later ranges are past the cap; drop the ones that haven't started
+                    for pending in futures[i + 1:]:
+                        pending.cancel()
+                    break
+    else:
+        results = _extract_from_reader(reader, list(range(page_count)), max_chars)
+    elapsed = time.perf_counter() - start
+
+    parts = []
+    chars = 0
+    failed = 0
+    for page_number, text, seconds, error in results:
+        logger.debug(f"{label}: page {page_number + 1} extracted in {seconds:.3f}s ({len(text)} chars)")
+        if seconds > settings.PDF_SLOW_PAGE_SECONDS:
+            logger.warning(f"{label}: slow page {page_number + 1} took {seconds:.2f}s")
+        if error:
+            failed += 1
+            logger.warning(f"{label}: failed to extract page {page_number + 1}: {error}")
+            continue
+        if chars + len(text) > max_chars:
+            parts.append(text[:max_chars - chars])
+            chars = max_chars
+            break
+        parts.append(text)
+        chars += len(text)
+
+    if results and failed == len(results):
+        raise ValueError(f"No readable pages in {label}")
+
+    slowest = max(results, key=lambda r: r[2]) if results else None
+    logger.info(
+        f"{label}: extracted {chars} chars from {len(results)}/{total_pages} pages in {elapsed:.2f}s"
+        + (f" (slowest: page {slowest[0] + 1}, {slowest[2]:.2f}s)" if slowest else "")
+    )
+    # Join once instead of repeated string concatenation
+    return "\n".join(parts)
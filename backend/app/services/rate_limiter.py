@@ -0,0 +1,169 @@
+import time
+import uuid
+import random
+import logging
+from contextlib import contextmanager
+from ..core.config import settings
+from ..core.redis_client import redis_conn
+
+logger = logging.getLogger(__name__)
+
+# Atomically checks the in-flight cap and both token buckets (requests/min and
+# tokens/min), then either consumes capacity and registers a lease, or returns
+# how long to wait. Buckets refill continuously; Redis TIME keeps every worker
+# on the same clock.
+ACQUIRE_SCRIPT = """
+local req_key, tok_key, inflight_key, stats_key = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local max_inflight = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local lease_id = ARGV[5]
+local lease_ttl = tonumber(ARGV[6])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local function level(key, capacity)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    return math.min(capacity, tokens + (now - ts) * capacity / 60)
+end
+
+redis.call('ZREMRANGEBYSCORE', inflight_key, '-inf', now)
+if max_inflight > 0 and redis.call('ZCARD', inflight_key) >= max_inflight then
+    return {0, 200}
+end
+
+local wait = 0
+local req_level, tok_level
+if rpm > 0 then
+    req_level = level(req_key, rpm)
+    if req_level < 1 then wait = math.max(wait, (1 - req_level) * 60 / rpm) end
+end
+if tpm > 0 then
+    cost = math.min(cost, tpm) -- an oversized request can still run on a full bucket
+    tok_level = level(tok_key, tpm)
+    if tok_level < cost then wait = math.max(wait, (cost - tok_level) * 60 / tpm) end
+end
+if wait > 0 then
+    return {0, math.ceil(wait * 1000)}
+end
+
+if rpm > 0 then
+    redis.call('HSET', req_key, 'tokens', req_level - 1, 'ts', now)
+    redis.call('EXPIRE', req_key, 120)
+end
+if tpm > 0 then
+    redis.call('HSET', tok_key, 'tokens', tok_level - cost, 'ts', now)
+    redis.call('EXPIRE', tok_key, 120)
+end
+redis.call('ZADD', inflight_key, now + lease_ttl, lease_id)
+redis.call('HINCRBY', stats_key, 'acquired', 1)
+redis.call('HINCRBY', stats_key, 'tokens_reserved', cost)
+return {1, 0}
+"""
+
+class RateLimitTimeout(Exception):
+    pass
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting
+    return len(text) // 4 + 1
+
+class RateLimiter:
+    """
+    Cluster-wide token-bucket limiter coordinated through Redis.
+    Enforces requests/min, tokens/min and a cap on in-flight calls across all
+    worker processes. Callers block until capacity is available.
+    """
+    def __init__(self, redis_client, name: str, rpm: int, tpm: int, max_inflight: int,
+                 lease_seconds: int = 120, max_wait_seconds: float = 300):
+        self.redis = redis_client
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_inflight = max_inflight
+        self.lease_seconds = lease_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self._script = redis_client.register_script(ACQUIRE_SCRIPT)
+
+    def _keys(self) -> list:
+        prefix = f"ratelimit:{self.name}"
+        return [f"{prefix}:requests", f"{prefix}:tokens", f"{prefix}:inflight", f"{prefix}:stats"]
+
+    def _wait_for_capacity(self, lease_id: str, tokens: int) -> bool:
+        """Blocks until capacity is granted. Returns False if Redis is unreachable."""
+        keys = self._keys()
+        waited = 0.0
+        try:
+            while True:
+                granted, wait_ms = self._script(
+                    keys=keys,
+                    args=[self.rpm, self.tpm, self.max_inflight, tokens, lease_id, self.lease_seconds]
+                )
+                if granted:
+                    break
+                if waited >= self.max_wait_seconds:
+                    self.redis.hincrby(keys[3], "timeouts", 1)
+                    raise RateLimitTimeout(f"{self.name}: no capacity after {waited:.1f}s")
+                # Jitter so workers that were blocked together don't retry together
+                delay = max(0.05, min(wait_ms / 1000 * random.uniform(1.0, 1.5), self.max_wait_seconds - waited))
+                time.sleep(delay)
+                waited += delay
+
+            if waited:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hincrby(keys[3], "waits", 1)
+                pipe.hincrbyfloat(keys[3], "wait_seconds", round(waited, 3))
+                pipe.execute()
+            return True
+        except RateLimitTimeout:
+            raise
+        except Exception as e:
+            # Redis unavailable: don't block parsing, fall back to tenacity retries alone
+            logger.warning(f"Rate limiter {self.name} unavailable, proceeding unthrottled: {e}")
+            return False
+
+    @contextmanager
+    def acquire(self, tokens: int = 1):
+        lease_id = str(uuid.uuid4())
+        if not self._wait_for_capacity(lease_id, tokens):
+            yield
+            return
+        try:
+            yield
+        finally:
+            try:
+                self.redis.zrem(self._keys()[2], lease_id)
+            except Exception as e:
+                logger.warning(f"Failed to release rate limiter lease: {e}")
+
+    def stats(self) -> dict:
+        keys = self._keys()
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hgetall(keys[3])
+        pipe.zcount(keys[2], time.time(), "+inf")
+        pipe.hget(keys[0], "tokens")
+        pipe.hget(keys[1], "tokens")
+        counters, inflight, req_level, tok_level = pipe.execute()
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "max_inflight": self.max_inflight,
+            "inflight": inflight,
+            "request_bucket_level": float(req_level) if req_level is not None else self.rpm,
+            "token_bucket_level": float(tok_level) if tok_level is not None else self.tpm,
+            **{k.decode(): float(v) for k, v in counters.items()}
+        }
+
+gemini_limiter = RateLimiter(
+    redis_conn,
+    name="gemini",
+    rpm=settings.GEMINI_RPM,
+    tpm=settings.GEMINI_TPM,
+    max_inflight=settings.GEMINI_MAX_INFLIGHT,
+    lease_seconds=settings.LLM_LIMITER_LEASE_SECONDS,
+    max_wait_seconds=settings.LLM_LIMITER_MAX_WAIT_SECONDS
+)
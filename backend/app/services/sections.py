@@ -0,0 +1,153 @@
+import re
+from typing import Dict, List, Optional
+from .rate_limiter import estimate_tokens
+
+# Constants
+SECTION_HEADERS = {
+    "skills": ["skills", "technical skills", "core competencies"],
+    "experience": ["experience", "work experience", "employment"],
+    "education": ["education", "academic"],
+    "projects": ["projects"],
+    "summary": ["about me", "summary", "profile"]
+}
+
+# Headers that end a section but carry little signal for extraction
+OTHER_HEADERS = [
+    "references", "publications", "interests", "hobbies", "awards",
+    "certifications", "languages", "volunteering", "activities"
+]
+
+# Order in which sections claim the prompt budget. "header" is the text before
+# the first heading (name, contact details).
+PROMPT_PRIORITY = ["header", "skills", "experience", "summary", "education", "projects"]
+
+SECTION_TITLES = {
+    "header": "Contact", "skills": "Skills", "experience": "Experience",
+    "summary": "Summary", "education": "Education", "projects": "Projects"
+}
+
+# Words that may precede a header without making it content,
+# e.g. "Professional Experience", "Work Experience", "Key Skills"
+HEADER_MODIFIERS = [
+    "professional", "technical", "work", "key", "core", "career", "employment",
+    "academic", "industry", "research", "personal", "additional", "selected", "other"
+]
+
+_HEADER_LOOKUP = {variant: name for name, variants in SECTION_HEADERS.items() for variant in variants}
+_HEADER_LOOKUP.update({variant: "other" for variant in OTHER_HEADERS})
+_HEADER_STRIP = re.compile(r"^[\s#*\-=_|]+|[\s:#*\-=_|]+$")
+# "Skills & Tools", "Education and Training", "Projects / Publications"
+_HEADER_JOIN = re.compile(r"\s*(?:&|\band\b|/|,)\s*")
+
+def _match_header(line: str):
+    """
+    Returns the section a heading line starts, or None for content. A line is a
+    heading when it is exactly a known header, a known header behind modifiers
+    from HEADER_MODIFIERS, or a known header joined to more by "&"/"and"/"/". Looser
+    matches ("Relevant Projects") need heading formatting: all caps or a
+    trailing colon. Lines that merely start or end with a header word
+    ("Experience with AWS", "5 years experience") are content.
+    """
+    stripped = _HEADER_STRIP.sub("", line)
+    candidate = stripped.lower()
+    if not candidate or len(candidate.split()) > 4:
+        return None
+    if candidate in _HEADER_LOOKUP:
+        return _HEADER_LOOKUP[candidate]
+
+    words = candidate.split()
+    for i in range(1, len(words)):
+        head = " ".join(words[i:])
+        if head in _HEADER_LOOKUP and all(word in HEADER_MODIFIERS for word in words[:i]):
+            return _HEADER_LOOKUP[head]
+
+    parts = [part for part in _HEADER_JOIN.split(candidate) if part]
+    if len(parts) > 1 and parts[0] in _HEADER_LOOKUP:
+        return _HEADER_LOOKUP[parts[0]]
+
+    formatted = stripped.isupper() or line.rstrip().endswith(":")
+    if formatted:
+        for variant, name in _HEADER_LOOKUP.items():
+            if candidate.startswith(variant + " ") or candidate.endswith(" " + variant):
+                return name
+    return None
+
+def segment_sections(text: str) -> Dict[str, str]:
+    """
+    Splits cleaned resume text into sections using SECTION_HEADERS.
+    Returns {section: text}; text before the first heading is "header", and
+    sections with low extraction value (references, publications, ...) are "other".
+    """
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in text.split("\n"):
+        name = _match_header(line)
+        if name:
+            current = name
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "\n".join(lines).strip()}
+
+def build_prompt_text(text: str, budget_tokens: int, include: Optional[List[str]] = None) -> str:
+    """
+    Assembles the text sent to the LLM from the most useful sections within a token budget.
+    Every present section first gets an equal share; leftover budget then goes to
+    truncated sections in PROMPT_PRIORITY order. `include` restricts the sections
+    used. Falls back to a plain head truncation when no usable headings are found.
+    """
+    budget_chars = budget_tokens * 4
+    sections = segment_sections(text)
+    present = [name for name in PROMPT_PRIORITY if name in sections and (include is None or name in include)]
+    if len(sections) <= 1 or not any(name != "header" for name in present):
+        # No headings found, or none of the wanted sections exist
+        return text[:budget_chars]
+
+    if include is None and estimate_tokens(text) <= budget_tokens and "other" not in sections:
+        return text
+
+    share = budget_chars // len(present)
+    allocated = {name: min(len(sections[name]), share) for name in present}
+    leftover = budget_chars - sum(allocated.values())
+    for name in present:
+        extra = min(len(sections[name]) - allocated[name], leftover)
+        allocated[name] += extra
+        leftover -= extra
+
+    parts = []
+    for name in present:
+        body = sections[name][:allocated[name]]
+        parts.append(body if name == "header" else f"{SECTION_TITLES[name]}:\n{body}")
+    return "\n\n".join(parts)
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """Packs whole lines into chunks of at most max_chars (overlong lines are split)."""
+    chunks, current, size = [], [], 0
+    for line in text.split("\n"):
+        line = line.strip()
+        while len(line) > max_chars:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+        if not line:
+            continue
+        if current and size + len(line) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+def section_chunks(text: str, max_chars: int) -> Dict[str, List[str]]:
+    """
+    Splits a resume into embedding-sized chunks per section, so nothing is lost to
+    the embedding model's input limit. Keys are those of segment_sections().
+    """
+    return {
+        name: chunks for name, body in segment_sections(text).items()
+        if (chunks := chunk_text(body, max_chars))
+    }
@@ -0,0 +1,126 @@
+import re
+import json
+import logging
+from collections import deque
+from typing import Dict, List
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+# Characters that extend a skill name ("c" must not match inside "c++" or "c#")
+_SUFFIX_CHARS = "+#"
+
+# List items: text between separators such as "C/C++", "Python, R, SQL" or "Languages: C"
+_LIST_ITEM_PATTERN = re.compile(r"[^,/|;()\[\]\n\u2022:]+")
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill alias in a taxonomy.
+    Finds all aliases in one pass over the text (linear in text length, whatever
+    the taxonomy size) and maps them to canonical skill names. Matches must sit
+    on word boundaries, so "java" does not match inside "javascript".
+
+    Single-letter aliases ("C", "R") are too ambiguous for word matching ("R&D",
+    "Plan C", "Section C"). They only match case-sensitively as a list item of
+    their own; longer aliases such as "c language" or "r programming" cover prose.
+    """
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        # Trie as parallel arrays: goto transitions, failure links, outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple]] = [[]] # (alias length, canonical)
+        self._letters: Dict[str, str] = {} # single-letter alias (uppercase) -> canonical
+
+        for canonical, aliases in taxonomy.items():
+            for alias in {canonical, *aliases}:
+                alias = " ".join(alias.lower().split())
+                if len(alias) == 1:
+                    self._letters[alias.upper()] = canonical
+                elif alias:
+                    self._add(alias, canonical)
+        self._build_failure_links()
+        logger.info(f"Skill matcher built: {len(taxonomy)} skills, {len(self._goto)} automaton states")
+
+    def _add(self, alias: str, canonical: str):
+        state = 0
+        for ch in alias:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(alias), canonical))
+
+    def _build_failure_links(self):
+        # Depth-1 states fail back to the root (already 0)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                # Inherit matches that end here through the failure link
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """Returns canonical skills found in the text, in order of first appearance."""
+        found = {}
+        if self._letters:
+            for match in _LIST_ITEM_PATTERN.finditer(text):
+                canonical = self._letters.get(match.group().strip())
+                if canonical:
+                    # Position in the whitespace-collapsed text the automaton scans
+                    found.setdefault(canonical, len(" ".join(text[:match.start()].split())))
+        text = " ".join(text.lower().split())
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, canonical in out[state]:
+                start = end - length + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end + 1 < len(text):
+                    nxt = text[end + 1]
+                    if (_is_word_char(nxt) and _is_word_char(text[end])) or nxt in _SUFFIX_CHARS:
+                        continue
+                if canonical not in found or start < found[canonical]:
+                    found[canonical] = start
+        return sorted(found, key=found.get)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        """Loads a JSON taxonomy of the form {"Canonical Skill": ["alias", ...]}."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+def load_skill_matcher() -> SkillMatcher:
+    try:
+        return SkillMatcher.from_file(settings.SKILLS_TAXONOMY_PATH)
+    except Exception as e:
+        logger.error(f"Could not load skills taxonomy from {settings.SKILLS_TAXONOMY_PATH}: {e}")
+        return SkillMatcher({})
+
+# Built once at import time; shared by every parse
+skill_matcher = load_skill_matcher()
+
+def normalize_skill(skill: str) -> str:
+    """
+    Filter key for a skill: the lowercased canonical name when the taxonomy knows
+    it ("k8s" -> "kubernetes"), otherwise the lowercased, whitespace-collapsed text.
+    """
+    canonical = skill_matcher.find(skill)
+    if len(canonical) == 1:
+        return canonical[0].lower()
+    return " ".join(skill.lower().split())
@@ -0,0 +1,60 @@
+import re
+import zlib
+from collections import Counter
+from typing import List, Tuple
+from .skills import skill_matcher
+from ..core.config import settings
+
+# Keeps "c++", "c#", "node.js", "k8s" and "soc 2" pieces intact; trailing dots are dropped
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their to was were will with "
+    "we you your our i me my they this these those".split()
+)
+
+# (indices, values) of a sparse vector
+SparseVectorData = Tuple[List[int], List[float]]
+
+def _token_index(token: str) -> int:
+    # Stable across processes and restarts (unlike hash()); fits Qdrant's uint32 indices
+    return zlib.crc32(token.encode("utf-8"))
+
+class BM25Encoder:
+    """
+    Local BM25-style sparse encoder for keyword matching (no external service).
+    Documents carry the BM25 term-frequency component; queries carry 1.0 per term.
+    The IDF component is applied by Qdrant at query time (Modifier.IDF on the
+    sparse vector), so it always reflects the current collection.
+    Skills found by the taxonomy matcher are added as extra "skill:<name>" terms,
+    so aliases ("k8s") and multi-word skills ("machine learning") match exactly.
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_tokens: float = 500):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_tokens = avg_doc_tokens
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens = [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+        tokens.extend(f"skill:{skill.lower()}" for skill in skill_matcher.find(text))
+        return tokens
+
+    def encode_document(self, text: str) -> SparseVectorData:
+        tokens = self.tokenize(text)
+        if not tokens:
+            return [], []
+        counts = Counter(_token_index(token) for token in tokens)
+        norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_doc_tokens)
+        indices = list(counts)
+        values = [tf * (self.k1 + 1) / (tf + norm) for tf in counts.values()]
+        return indices, values
+
+    def encode_query(self, text: str) -> SparseVectorData:
+        indices = list(dict.fromkeys(_token_index(token) for token in self.tokenize(text)))
+        return indices, [1.0] * len(indices)
+
+bm25_encoder = BM25Encoder(
+    k1=settings.SPARSE_BM25_K1,
+    b=settings.SPARSE_BM25_B,
+    avg_doc_tokens=settings.SPARSE_AVG_DOC_TOKENS
+)
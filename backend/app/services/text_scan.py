@@ -0,0 +1,81 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+# Precompiled once at import; every resume reuses them.
+# Three or more newlines, so the pattern has a literal prefix the regex engine can search for
+BLANK_LINES_PATTERN = re.compile(r"\n\n\n+")
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+DEGREE_PATTERN = re.compile(r"\b(bachelor|master|ph\.?d|doctorate|b\.?sc|m\.?sc|b\.?a|m\.?a|mba|b\.?eng|m\.?eng|diploma|degree|university|college|institute)\b", re.IGNORECASE)
+DATE_RANGE_PATTERN = re.compile(r"(20\d{2})\s*-\s*((?i:present)|20\d{2})")
+BULLET_CHARS = ("•", "●", "▪")
+EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-")
+
+# Every basic field in one alternation, so the text is walked once. The lookahead
+# lets the engine skip straight past anything that cannot start a match (most of
+# a resume). Links are found from "://" and emails from "@", then widened to the
+# scheme / local part; that keeps the email branch from backtracking at every
+# letter, which made a naive combined pattern slower than separate searches.
+# Links and date ranges are tried before phone numbers, so digits inside a URL or
+# a "2019 - 2023" range are never taken for a phone number.
+BASICS_PATTERN = re.compile(
+    r"(?=[:@+(\d])(?:"
+    r":(?P<link>//\S+)"
+    r"|@(?P<domain>[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)"
+    r"|(?P<date_start>20\d{2})\s*-\s*(?P<date_end>(?i:present)|20\d{2})"
+    r"|(?P<phone>(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})"
+    r")"
+)
+
+class BasicFields(NamedTuple):
+    email: Optional[str]
+    phone: Optional[str]
+    links: Tuple[str, ...]
+    date_ranges: Tuple[Tuple[str, str], ...] # (start year, end year or "present")
+
+def clean_text(text: str) -> str:
+    """Normalizes tabs and bullet glyphs and collapses runs of blank lines."""
+    # Chained str.replace beats both re.sub and str.translate on these inputs
+    text = text.replace("\t", " ")
+    for bullet in BULLET_CHARS:
+        text = text.replace(bullet, "-")
+    return BLANK_LINES_PATTERN.sub("\n\n", text).strip()
+
+def _email_start(text: str, at: int) -> int:
+    start = at
+    while start > 0 and text[start - 1] in EMAIL_LOCAL_CHARS:
+        start -= 1
+    return start
+
+@lru_cache(maxsize=64)
+def scan_basics(text: str) -> BasicFields:
+    """
+    Collects email, phone, links and experience date ranges in a single pass.
+    Cached per text, since the deterministic tier, the regex fallback and result
+    assembly all ask about the same resume.
+    """
+    email = phone = None
+    links = []
+    date_ranges = []
+    for match in BASICS_PATTERN.finditer(text):
+        kind = match.lastgroup
+        start = match.start()
+        if kind == "link":
+            for scheme in ("https", "http"):
+                if start >= len(scheme) and text.startswith(scheme, start - len(scheme)):
+                    links.append(text[start - len(scheme):match.end()])
+                    break
+        elif kind == "date_end":
+            date_ranges.append((match.group("date_start"), match.group("date_end").lower()))
+        elif kind == "domain":
+            if email is None:
+                local_start = _email_start(text, start)
+                if local_start < start:
+                    email = text[local_start:match.end()]
+        elif kind == "phone" and phone is None:
+            phone = match.group(0)
+    return BasicFields(email, phone, tuple(links), tuple(date_ranges))
+
+def find_date_ranges(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Date ranges within a fragment of a resume (e.g. a single section)."""
+    return tuple((start, end.lower()) for start, end in DATE_RANGE_PATTERN.findall(text))
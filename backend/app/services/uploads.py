@@ -0,0 +1,230 @@
+import os
+import logging
+import zipfile
+import tempfile
+import mimetypes
+from typing import BinaryIO, Iterator, Optional, Union
+from appwrite.input_file import InputFile
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024 # 1MB
+
+# Appwrite's SDK sends files up to its chunk size (5MB) in a single request, read
+# fully into memory whatever the InputFile source; only larger files are uploaded
+# in chunks, and only from_path reads those chunks from disk one at a time
+SINGLE_REQUEST_BYTES = 5 * 1024 * 1024
+
+# Types the parser can read. Anything else (e.g. legacy .doc) is rejected even if
+# ALLOWED_RESUME_TYPES lists it, instead of failing later in the worker.
+SUPPORTED_RESUME_TYPES = ("pdf", "docx", "txt")
+
+# Leading bytes expected for each allowed resume type.
+# txt has no signature; it is rejected if the first chunk looks binary instead.
+MAGIC_BYTES = {
+    "pdf": [b"%PDF-"],
+    "docx": [b"PK\x03\x04"],
+}
+
+class UploadRejected(Exception):
+    """Raised when an upload fails validation. Carries the HTTP status to return."""
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+class UploadedResume:
+    """
+    A validated resume of at most SINGLE_REQUEST_BYTES, still held in the web
+    framework's upload spool (Starlette's UploadFile is already a
+    SpooledTemporaryFile), so it is not copied to another temp file. The SDK
+    uploads files this small from memory in one request anyway. The framework
+    closes the stream.
+    """
+    def __init__(self, stream: BinaryIO, filename: str, mime_type: Optional[str], size: int):
+        self.stream = stream
+        self.filename = filename
+        self.mime_type = mime_type
+        self.size = size
+
+    def to_input_file(self) -> InputFile:
+        # At most SINGLE_REQUEST_BYTES; larger uploads are spooled to disk by validate_upload
+        self.stream.seek(0)
+        return InputFile.from_bytes(self.stream.read(), filename=self.filename, mime_type=self.mime_type)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class SpooledResume:
+    """
+    A validated resume spooled to a temporary file on disk.
+    Use as a context manager so the temp file is always removed.
+    """
+    def __init__(self, path: str, filename: str, mime_type: Optional[str], size: int):
+        self.path = path
+        self.filename = filename
+        self.mime_type = mime_type
+        self.size = size
+
+    def to_input_file(self) -> InputFile:
+        # from_path lets the SDK upload large files in chunks straight from disk
+        input_file = InputFile.from_path(self.path)
+        input_file.filename = self.filename
+        if self.mime_type:
+            input_file.mime_type = self.mime_type
+        return input_file
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def max_resume_bytes() -> int:
+    return settings.MAX_RESUME_FILE_SIZE_MB * 1024 * 1024
+
+def resume_extension(filename: Optional[str]) -> str:
+    return os.path.splitext(filename or "")[1].lower().lstrip(".")
+
+def is_allowed_resume(filename: Optional[str]) -> bool:
+    ext = resume_extension(filename)
+    return ext in SUPPORTED_RESUME_TYPES and ext in [t.strip().lower() for t in settings.ALLOWED_RESUME_TYPES]
+
+def _check_upload(filename: str, declared_size: Optional[int]) -> str:
+    """Checks extension and declared size before any content is read. Returns the extension."""
+    if not is_allowed_resume(filename):
+        allowed = [t for t in settings.ALLOWED_RESUME_TYPES if t.strip().lower() in SUPPORTED_RESUME_TYPES]
+        raise UploadRejected(f"{filename}: file type not allowed ({', '.join(allowed)})", status_code=415)
+    if declared_size is not None and declared_size > max_resume_bytes():
+        raise UploadRejected(f"{filename}: exceeds {settings.MAX_RESUME_FILE_SIZE_MB}MB limit", status_code=413)
+    return resume_extension(filename)
+
+def _check_signature(ext: str, head: bytes, filename: str):
+    signatures = MAGIC_BYTES.get(ext)
+    if signatures is not None:
+        if not any(head.startswith(sig) for sig in signatures):
+            raise UploadRejected(f"{filename}: content does not match .{ext} format", status_code=415)
+    elif b"\x00" in head:
+        raise UploadRejected(f"{filename}: binary content in a .{ext} file", status_code=415)
+
+def spool_resume(stream: BinaryIO, filename: str, mime_type: Optional[str] = None,
+                 declared_size: Optional[int] = None) -> SpooledResume:
+    """
+    Copies a resume stream to disk in fixed-size chunks, rejecting it as early as possible:
+    by extension, then declared size, then magic bytes of the first chunk, then running size.
+    Nothing is sent to storage until the whole file has passed.
+    """
+    ext = _check_upload(filename, declared_size)
+    max_bytes = max_resume_bytes()
+
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f".{ext}")
+    try:
+        size = 0
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if size == 0:
+                _check_signature(ext, chunk, filename)
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadRejected(f"{filename}: exceeds {settings.MAX_RESUME_FILE_SIZE_MB}MB limit", status_code=413)
+            tmp_file.write(chunk)
+
+        if size == 0:
+            raise UploadRejected(f"{filename}: empty file")
+        tmp_file.close()
+        return SpooledResume(tmp_file.name, filename, mime_type, size)
+    except Exception:
+        tmp_file.close()
+        os.remove(tmp_file.name)
+        raise
+
+def validate_upload(stream: BinaryIO, filename: str, mime_type: Optional[str] = None,
+                    declared_size: Optional[int] = None) -> Union[UploadedResume, SpooledResume]:
+    """
+    Validates an already-spooled, seekable upload in place (extension, declared and
+    real size, magic bytes). Files up to SINGLE_REQUEST_BYTES are uploaded from the
+    stream as they are; larger ones are spooled to a named temp file so the SDK
+    uploads them in chunks from disk. Use spool_resume for streams that are not
+    seekable, such as archive entries.
+    """
+    ext = _check_upload(filename, declared_size)
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    if size == 0:
+        raise UploadRejected(f"{filename}: empty file")
+    if size > max_resume_bytes():
+        raise UploadRejected(f"{filename}: exceeds {settings.MAX_RESUME_FILE_SIZE_MB}MB limit", status_code=413)
+    _check_signature(ext, stream.read(CHUNK_SIZE), filename)
+    stream.seek(0)
+    if size > SINGLE_REQUEST_BYTES:
+        # Starlette's rolled-over spool is an unnamed temp file, so from_path can't use it
+        return spool_resume(stream, filename, mime_type, size)
+    return UploadedResume(stream, filename, mime_type, size)
+
+# --- ZIP archives ---
+
+def open_resume_archive(stream: BinaryIO) -> zipfile.ZipFile:
+    """
+    Opens an uploaded ZIP archive without extracting it. Only the central directory
+    is read here; archives with too many entries or an implausible total
+    uncompressed size are rejected up front.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise UploadRejected("Archive is not a valid ZIP file", status_code=400)
+
+    infos = archive.infolist()
+    if len(infos) > settings.ARCHIVE_MAX_ENTRIES:
+        archive.close()
+        raise UploadRejected(f"Archive has {len(infos)} entries (limit {settings.ARCHIVE_MAX_ENTRIES})", status_code=413)
+
+    total_size = sum(info.file_size for info in infos)
+    if total_size > settings.ARCHIVE_MAX_TOTAL_UNCOMPRESSED_MB * 1024 * 1024:
+        archive.close()
+        raise UploadRejected(f"Archive expands beyond {settings.ARCHIVE_MAX_TOTAL_UNCOMPRESSED_MB}MB", status_code=413)
+
+    return archive
+
+def iter_archive_entries(archive: zipfile.ZipFile) -> Iterator[zipfile.ZipInfo]:
+    """Yields file entries, skipping directories and OS metadata (e.g. __MACOSX/, dotfiles)."""
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        name = os.path.basename(info.filename)
+        if not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+            continue
+        yield info
+
+def spool_archive_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> SpooledResume:
+    """
+    Streams one archive entry through the same validation as a direct upload.
+    The header sizes are checked first, but spool_resume also counts the real
+    decompressed bytes, so a lying header cannot inflate past the size cap.
+    """
+    filename = os.path.basename(info.filename)
+    if info.flag_bits & 0x1:
+        raise UploadRejected(f"{filename}: encrypted entries are not supported", status_code=415)
+    if info.file_size > max_resume_bytes():
+        raise UploadRejected(f"{filename}: exceeds {settings.MAX_RESUME_FILE_SIZE_MB}MB limit", status_code=413)
+    if info.compress_size and info.file_size / info.compress_size > settings.ARCHIVE_MAX_COMPRESSION_RATIO:
+        raise UploadRejected(f"{filename}: suspicious compression ratio", status_code=413)
+
+    mime_type = mimetypes.guess_type(filename)[0]
+    with archive.open(info) as stream:
+        return spool_resume(stream, filename, mime_type, info.file_size)
@@ -0,0 +1,178 @@
+import json
+import time
+import logging
+from typing import Callable, List, Optional, Tuple
+from qdrant_client.http import models
+from ..core.config import settings
+from ..core.redis_client import redis_conn
+from .vector_store import vector_store
+
+logger = logging.getLogger(__name__)
+
+# Re-embeds a batch of scrolled records into (point id, named vectors, metadata) items;
+# records it cannot re-embed are left out
+ReembedFn = Callable[[list], List[Tuple[str, dict, dict]]]
+
+# indexed_at is stamped by worker clocks; look back this far to absorb clock skew
+CATCH_UP_MARGIN_SECONDS = 60
+
+class VectorMigration:
+    """
+    Rebuilds the live collection into a new versioned collection (candidates_v{n})
+    with the current embedding settings, then swaps the `candidates_live` alias to
+    it atomically. The source, including a legacy unversioned `candidates`
+    collection (version 0), keeps serving until the swap and is kept afterwards
+    for catch-up and rollback.
+
+    Phases: "copy" scrolls the source in batches, re-embeds each batch from the
+    resume text stored in the payload and bulk-upserts it under the same point
+    IDs; the scroll offset is checkpointed in Redis after every batch, so an
+    interrupted run resumes where it stopped. "catch_up" re-copies points indexed
+    (indexed_at) since the previous pass began, while each pass finds fewer.
+    Then the alias is swapped ("swapped") and, once every process runs the new
+    settings, finish() closes the migration ("done").
+    """
+    STATE_KEY = "vector_migration:state"
+
+    def __init__(self, store, redis_client=None, batch_size: int = 64):
+        self.store = store
+        self.redis = redis_client
+        self.batch_size = batch_size
+
+    def status(self) -> Optional[dict]:
+        raw = self.redis.get(self.STATE_KEY)
+        return json.loads(raw) if raw else None
+
+    def _save(self, state: dict):
+        self.redis.set(self.STATE_KEY, json.dumps(state))
+
+    def start(self, dim: int) -> dict:
+        """Creates the target collection, or returns the unfinished migration to resume."""
+        state = self.status()
+        if state and state["phase"] != "done":
+            logger.info(f"Resuming migration {state['source']} -> {state['target']} (phase {state['phase']}, {state['copied']} copied)")
+            return state
+
+        client = self.store.client
+        source = self.store.alias_target()
+        if source is None:
+            raise RuntimeError(f"Alias {self.store.alias} points at no collection; nothing to migrate")
+        target = self.store.versioned_name(max(self.store.collection_versions(), default=0) + 1)
+        self.store.create_collection(target, dim)
+        self.store.ensure_payload_indexes(target)
+        now = time.time()
+        state = {
+            "source": source,
+            "target": target,
+            "dim": dim,
+            "phase": "copy",
+            "offset": None,
+            "copied": 0,
+            "skipped": 0,
+            "started_at": now,
+            "pass_started_at": now
+        }
+        self._save(state)
+        logger.info(f"Started migration {source} ({client.get_collection(source).points_count} points) -> {target} (dim {dim})")
+        return state
+
+    def _copy(self, state: dict, reembed: ReembedFn, scroll_filter: models.Filter = None, checkpoint: bool = True) -> int:
+        """Copies (re-embedded) source points into the target. Returns how many were written."""
+        client = self.store.client
+        offset = state["offset"] if checkpoint else None
+        written = 0
+        while True:
+            records, next_offset = client.scroll(
+                collection_name=state["source"],
+                scroll_filter=scroll_filter,
+                limit=self.batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            items = reembed(records) if records else []
+            if items:
+                client.upsert(
+                    collection_name=state["target"],
+                    points=[self.store._point(point_id, vectors, metadata) for point_id, vectors, metadata in items],
+                    wait=True
+                )
+            written += len(items)
+            state["copied"] += len(items)
+            state["skipped"] += len(records) - len(items)
+            if checkpoint:
+                state["offset"] = next_offset
+                self._save(state)
+            logger.info(f"Migration {state['target']}: {state['copied']} copied, {state['skipped']} skipped")
+            if next_offset is None:
+                return written
+            offset = next_offset
+
+    def catch_up(self, reembed: ReembedFn, max_passes: int = 3) -> dict:
+        """
+        Re-copies source points indexed since the last pass began. Runs before the
+        swap, and again after it for writes made by processes still on the old
+        settings during the rollout.
+        """
+        state = self.status()
+        if not state or state["phase"] not in ("catch_up", "swapped"):
+            raise RuntimeError("No migration waiting for catch-up")
+        if state["source"] not in self.store.collection_versions().values():
+            logger.warning(f"Source {state['source']} no longer exists; nothing to catch up")
+            return state
+        previous = None
+        for _ in range(max_passes):
+            since = state["pass_started_at"] - CATCH_UP_MARGIN_SECONDS
+            state["pass_started_at"] = time.time()
+            written = self._copy(
+                state, reembed,
+                scroll_filter=models.Filter(must=[models.FieldCondition(key="indexed_at", range=models.Range(gte=since))]),
+                checkpoint=False
+            )
+            self._save(state)
+            # Not shrinking means a steady trickle of live writes (or the margin re-reading
+            # the same ones); another pass would not converge
+            if not written or (previous is not None and written >= previous):
+                break
+            previous = written
+        return state
+
+    def run(self, reembed: ReembedFn, dim: int, swap: bool = True) -> dict:
+        state = self.start(dim)
+        if state["phase"] == "copy":
+            self._copy(state, reembed)
+            state["phase"] = "catch_up"
+            self._save(state)
+        if state["phase"] == "catch_up":
+            state = self.catch_up(reembed)
+            if swap:
+                self.swap(state)
+        return state
+
+    def swap(self, state: dict = None) -> dict:
+        state = state or self.status()
+        if not state or state["phase"] != "catch_up":
+            raise RuntimeError("No copied migration waiting for the alias swap")
+        self.store.swap_alias(state["target"])
+        state["phase"] = "swapped"
+        state["swapped_at"] = time.time()
+        self._save(state)
+        logger.info(f"Migration swapped: {self.store.alias} -> {state['target']}. Roll out the new embedding settings, then catch up and finish.")
+        return state
+
+    def finish(self, drop_source: bool = False) -> dict:
+        state = self.status()
+        if not state or state["phase"] != "swapped":
+            raise RuntimeError("No swapped migration to finish")
+        if drop_source and state["source"] in self.store.collection_versions().values():
+            logger.info(f"Dropping migrated source collection {state['source']}")
+            self.store.client.delete_collection(state["source"])
+        state["phase"] = "done"
+        self._save(state)
+        return state
+
+vector_migration = VectorMigration(
+    vector_store,
+    redis_client=redis_conn,
+    batch_size=settings.VECTOR_MIGRATION_BATCH_SIZE
+)
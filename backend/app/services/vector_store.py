@@ -4,13 +4,96 @@ from qdrant_client.http.models import Distance, VectorParams
 from ..core.config import settings
 import uuid
 import logging
+from typing import Callable
 
 logger = logging.getLogger(__name__)
 
+# Named vectors stored per point: the whole resume, plus one per section
+# (chunk embeddings mean-pooled, see sections.section_chunks)
+RESUME_VECTOR = "resume"
+SECTION_VECTORS = ["summary", "skills", "experience", "education", "projects"]
+VECTOR_NAMES = [RESUME_VECTOR] + SECTION_VECTORS
+# Sparse BM25 keyword vector (see sparse.py); IDF is applied by Qdrant
+SPARSE_VECTOR = "keywords"
+
+# How per-vector similarities are combined into one match score. "hybrid" fuses
+# every section ranking and the keyword ranking server-side (weighted RRF);
+# the others aggregate dense section scores client-side.
+AGGREGATIONS = ("hybrid", "max", "mean", "weighted")
+
+# Payload fields searches filter on; indexed so filters don't scan the collection
+PAYLOAD_INDEXES = {
+    "job_id": models.PayloadSchemaType.KEYWORD,
+    "candidate_id": models.PayloadSchemaType.KEYWORD,
+    "person_key": models.PayloadSchemaType.KEYWORD,
+    "application_id": models.PayloadSchemaType.KEYWORD,
+    "skill_keys": models.PayloadSchemaType.KEYWORD,
+    "experience_years": models.PayloadSchemaType.FLOAT,
+    "indexed_at": models.PayloadSchemaType.FLOAT,
+}
+
+# Fixed namespace for deterministic point IDs; changing it orphans every existing point
+POINT_ID_NAMESPACE = uuid.UUID("74d8a2b1-c254-4e33-be50-de636eae8215")
+
+def point_id(application_id: str, kind: str = RESUME_VECTOR) -> str:
+    """
+    Point ID derived from the application and the kind of point, so re-indexing an
+    application (retries, re-runs, migrations) overwrites its point instead of
+    adding a duplicate. One point per application currently carries all named
+    vectors, so `kind` is always RESUME_VECTOR.
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{application_id}:{kind}"))
+
+def person_key(candidate_id: str, email: str = None) -> str:
+    """
+    Talent search grouping key for the person behind an application. Every
+    application creates its own candidate document, so candidate_id alone never
+    groups anything; the normalized resume email does, falling back to the
+    candidate for resumes without one.
+    """
+    email = (email or "").strip().lower()
+    return f"email:{email}" if email else f"candidate:{candidate_id}"
+
+# Stored resume text is only read back by migrations, never by searches
+SEARCH_PAYLOAD = models.PayloadSelectorExclude(exclude=["text"])
+
+def _parse_weights(spec: str) -> dict:
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition(":")
+        if name.strip() and weight.strip():
+            weights[name.strip()] = float(weight)
+    return weights
+
+QUANTIZATIONS = ("none", "scalar", "binary")
+
+def _quantization_config():
+    """Quantization for the dense vectors from QDRANT_QUANTIZATION (None = full float32 only)."""
+    kind = settings.QDRANT_QUANTIZATION
+    if kind not in QUANTIZATIONS:
+        raise ValueError(f"Unknown QDRANT_QUANTIZATION '{kind}', expected one of {QUANTIZATIONS}")
+    always_ram = settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+    if kind == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=always_ram)
+        )
+    if kind == "binary":
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=always_ram))
+    return None
+
 class VectorStore:
+    """
+    Reads and writes go to the collection that the QDRANT_COLLECTION_ALIAS alias
+    (`candidates_live`) points at: a versioned collection (candidates_v{n}), or
+    the legacy unversioned `candidates` collection as version 0. It is resolved
+    once per process, so running instances keep their collection while a
+    migration swaps the alias (see vector_migration.py); restart them to follow it.
+    """
     def __init__(self):
         self._client = None
-        self.collection_name = "candidates"
+        self.base_name = settings.QDRANT_COLLECTION
+        self.alias = settings.QDRANT_COLLECTION_ALIAS
+        self.collection_name = self.alias
 
     @property
     def client(self):
@@ -19,89 +102,515 @@ class VectorStore:
             self._ensure_collection()
         return self._client
 
+    def versioned_name(self, version: int) -> str:
+        return f"{self.base_name}_v{version}"
+
+    def collection_versions(self) -> dict:
+        """Returns {version: collection name}; the legacy unversioned collection is version 0."""
+        versions = {}
+        prefix = f"{self.base_name}_v"
+        for collection in self.client.get_collections().collections:
+            if collection.name == self.base_name:
+                versions[0] = collection.name
+            elif collection.name.startswith(prefix) and collection.name[len(prefix):].isdigit():
+                versions[int(collection.name[len(prefix):])] = collection.name
+        return versions
+
+    def alias_target(self) -> str:
+        """Collection the alias points at, or None."""
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == self.alias:
+                return alias.collection_name
+        return None
+
+    def layout_matches(self, info, dim: int) -> bool:
+        vectors = info.config.params.vectors
+        # Collections from before section vectors hold a single unnamed vector
+        sizes = {name: params.size for name, params in vectors.items()} if isinstance(vectors, dict) else {}
+        sparse = info.config.params.sparse_vectors or {}
+        return all(sizes.get(name) == dim for name in VECTOR_NAMES) and SPARSE_VECTOR in sparse
+
+    def create_collection(self, name: str, dim: int):
+        logger.info(f"Creating Qdrant collection: {name} with dim {dim}")
+        self.client.create_collection(
+            collection_name=name,
+            vectors_config={vector_name: self.dense_vector_params(dim) for vector_name in VECTOR_NAMES},
+            sparse_vectors_config={
+                SPARSE_VECTOR: models.SparseVectorParams(modifier=models.Modifier.IDF)
+            },
+            # Resume text is kept in the payload for re-embedding; it is never filtered on
+            on_disk_payload=True
+        )
+
     def _ensure_collection(self):
         from .embeddings import embedding_service
         desired_dim = embedding_service.get_dimension()
+        target = self.alias_target()
+        if target is None:
+            # First start with the alias: adopt the newest existing collection (the legacy
+            # unversioned one is version 0) instead of starting an empty one
+            versions = self.collection_versions()
+            if versions:
+                target = versions[max(versions)]
+            else:
+                target = self.versioned_name(1)
+                self.create_collection(target, desired_dim)
+            self.swap_alias(target)
+
+        info = self.client.get_collection(target)
+        if not self.layout_matches(info, desired_dim):
+            # Never drop indexed resumes here: a layout change is an online migration.
+            # During a rollout, processes on the other embedding config pin whichever
+            # version matches them (the old one before the swap, the new one after).
+            matching = [
+                name for version, name in sorted(self.collection_versions().items(), reverse=True)
+                if self.layout_matches(self.client.get_collection(name), desired_dim)
+            ]
+            if matching:
+                logger.warning(f"Alias {self.alias} -> {target} does not match dim {desired_dim}; using {matching[0]}")
+                target = matching[0]
+            else:
+                logger.error(
+                    f"Collection {target} does not match the vector layout {VECTOR_NAMES} with dim {desired_dim} "
+                    f"+ sparse '{SPARSE_VECTOR}'. Run scripts/migrate_vectors.py with the new embedding settings "
+                    f"to re-embed into a new collection."
+                )
+                self.collection_name = target
+                return
+            info = self.client.get_collection(target)
+
+        self.collection_name = target
+        self._sync_vector_config(info)
+        self.ensure_payload_indexes()
+
+    def swap_alias(self, target: str):
+        """Points the alias at `target` in one atomic alias update. No collection is deleted."""
+        operations = [
+            models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=target, alias_name=self.alias))
+        ]
+        if self.alias_target() is not None:
+            operations.insert(0, models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=self.alias)))
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        logger.info(f"Alias {self.alias} -> {target}")
+
+    def dense_vector_params(self, dim: int) -> VectorParams:
+        return VectorParams(
+            size=dim,
+            distance=Distance.COSINE,
+            on_disk=settings.QDRANT_ON_DISK_VECTORS,
+            hnsw_config=models.HnswConfigDiff(m=settings.QDRANT_HNSW_M, ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT),
+            quantization_config=_quantization_config()
+        )
+
+    def _sync_vector_config(self, info):
+        """
+        Brings an existing collection's storage settings (quantization kind, on_disk,
+        HNSW m/ef_construct) in line with Settings. Qdrant rebuilds the affected
+        indexes in the background; the collection keeps serving meanwhile.
+        """
+        quantization = _quantization_config()
+        drifted = []
+        for name in VECTOR_NAMES:
+            params = info.config.params.vectors[name]
+            hnsw = params.hnsw_config or models.HnswConfigDiff()
+            current_quantization = params.quantization_config or info.config.quantization_config
+            if (bool(params.on_disk) != settings.QDRANT_ON_DISK_VECTORS
+                    or (hnsw.m or info.config.hnsw_config.m) != settings.QDRANT_HNSW_M
+                    or (hnsw.ef_construct or info.config.hnsw_config.ef_construct) != settings.QDRANT_HNSW_EF_CONSTRUCT
+                    or type(current_quantization) is not type(quantization)):
+                drifted.append(name)
+        if not drifted:
+            return
+        logger.info(f"Updating storage config of vectors {drifted} (quantization={settings.QDRANT_QUANTIZATION}, on_disk={settings.QDRANT_ON_DISK_VECTORS}, m={settings.QDRANT_HNSW_M}, ef_construct={settings.QDRANT_HNSW_EF_CONSTRUCT})")
         try:
-            info = self._client.get_collection(self.collection_name)
-            if info.config.params.vectors.size != desired_dim:
-                logger.warning(f"Collection dimension mismatch (Expected: {desired_dim}, Got: {info.config.params.vectors.size}). Recreating collection...")
-                self._client.delete_collection(self.collection_name)
-                # Helper to re-create immediately? or let recursion/error handling logic work?
-                # The generic except block below would catch and create.
-                # raising Exception to trigger the except block below
-                raise Exception("Collection deleted due to dimension mismatch")
-        except Exception:
-            # Create collection if not exists or was deleted
-            logger.info(f"Creating Qdrant collection: {self.collection_name} with dim {desired_dim}")
-            self._client.create_collection(
+            self.client.update_collection(
                 collection_name=self.collection_name,
-                vectors_config=VectorParams(size=desired_dim, distance=Distance.COSINE),
+                vectors_config={
+                    name: models.VectorParamsDiff(
+                        on_disk=settings.QDRANT_ON_DISK_VECTORS,
+                        hnsw_config=models.HnswConfigDiff(m=settings.QDRANT_HNSW_M, ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT),
+                        quantization_config=quantization or models.Disabled.DISABLED
+                    ) for name in drifted
+                }
+            )
+        except Exception as e:
+            # Searches still work on the old storage settings
+            logger.error(f"Failed to update storage config of {self.collection_name}: {e}")
+
+    def search_params(self, exact: bool = False) -> models.SearchParams:
+        """
+        Dense search parameters: QDRANT_SEARCH_EF, plus rescoring/oversampling when
+        vectors are quantized. exact=True does a full scan over the original vectors
+        (benchmark ground truth).
+        """
+        if exact:
+            return models.SearchParams(exact=True, quantization=models.QuantizationSearchParams(ignore=True))
+        quantization = None
+        if settings.QDRANT_QUANTIZATION != "none":
+            quantization = models.QuantizationSearchParams(
+                rescore=settings.QDRANT_RESCORE,
+                oversampling=settings.QDRANT_OVERSAMPLING
+            )
+        return models.SearchParams(hnsw_ef=settings.QDRANT_SEARCH_EF or None, quantization=quantization)
+
+    def ensure_payload_indexes(self, collection_name: str = None):
+        """Creates any missing (or mistyped) payload index from PAYLOAD_INDEXES."""
+        client = self.client
+        collection_name = collection_name or self.collection_name
+        schema = client.get_collection(collection_name).payload_schema or {}
+        for field, field_type in PAYLOAD_INDEXES.items():
+            existing = schema.get(field)
+            if existing is not None and existing.data_type == field_type:
+                continue
+            logger.info(f"Creating payload index on {collection_name}.{field} ({field_type.value})")
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field,
+                field_schema=field_type,
+                wait=True
             )
 
-    def upsert_embedding(self, embedding: list[float], metadata: dict) -> str:
+    def _point(self, vector_id: str, vectors: dict, metadata: dict) -> models.PointStruct:
+        sparse = vectors.get(SPARSE_VECTOR)
+        vectors = {name: vector for name, vector in vectors.items() if name in VECTOR_NAMES and vector}
+        if sparse and sparse[0]:
+            indices, values = sparse
+            vectors[SPARSE_VECTOR] = models.SparseVector(indices=list(indices), values=list(values))
+        # Record which sections exist so scoring doesn't penalize a resume for a missing section
+        return models.PointStruct(id=vector_id, vector=vectors, payload={**metadata, "vectors": sorted(vectors)})
+
+    def upsert_embedding(self, vectors: dict, metadata: dict) -> str:
         """
-        Upserts an embedding into Qdrant. Returns the vector ID (UUID).
+        Upserts the named vectors (RESUME_VECTOR, any SECTION_VECTORS, and the
+        SPARSE_VECTOR as (indices, values)) of one application into Qdrant.
+        Returns the vector ID (deterministic UUID, see point_id).
         """
-        vector_id = str(uuid.uuid4())
-        logger.info(f"Upserting embedding for candidate {metadata.get('candidate_id')} (vector_id: {vector_id})")
+        vector_id = point_id(metadata['application_id'])
+        logger.info(f"Upserting embedding for candidate {metadata.get('candidate_id')} (vector_id: {vector_id}, vectors: {sorted(vectors)})")
         
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[self._point(vector_id, vectors, metadata)]
+        )
+        return vector_id
+
+    def upsert_embeddings(self, items: list[tuple[dict, dict]]) -> list[str]:
+        """
+        Upserts many (named vectors, metadata) pairs in a single request.
+        Returns the vector IDs in input order.
+        """
+        vector_ids = [point_id(metadata['application_id']) for _, metadata in items]
+        logger.info(f"Upserting {len(items)} embeddings in one batch")
+
         self.client.upsert(
             collection_name=self.collection_name,
             points=[
-                models.PointStruct(
-                    id=vector_id,
-                    vector=embedding,
-                    payload=metadata
-                )
+                self._point(vector_id, vectors, metadata)
+                for vector_id, (vectors, metadata) in zip(vector_ids, items)
             ]
         )
-        return vector_id
+        return vector_ids
 
-    def search_vectors(self, query_embedding: list[float], top_k: int = 10, filter_metadata: dict = None) -> list:
+    def _build_filter(self, filter_metadata: dict = None, must_have_skills: list = None,
+                      min_experience_years: float = None) -> models.Filter:
         """
-        Search for similar vectors. 
-        Returns list of (id, score, metadata).
+        Exact-match conditions from filter_metadata, plus one condition per required
+        skill (normalized keys, see skills.normalize_skill) and a minimum experience.
+        All of them hit payload indexes, so Qdrant applies them during the search.
         """
-        logger.info(f"Searching vectors with top_k={top_k}, filter={filter_metadata}")
-        response = self.client.query_points(
+        must = [
+            models.FieldCondition(
+                key=k,
+                match=models.MatchValue(value=v)
+            ) for k, v in (filter_metadata or {}).items()
+        ]
+        for skill_key in must_have_skills or []:
+            must.append(models.FieldCondition(key="skill_keys", match=models.MatchValue(value=skill_key)))
+        if min_experience_years is not None:
+            must.append(models.FieldCondition(key="experience_years", range=models.Range(gte=min_experience_years)))
+        return models.Filter(must=must)
+
+    def search_vectors(self, query_embedding: list[float], top_k: int = 10, filter_metadata: dict = None,
+                       aggregation: str = None, offset: int = 0, score_threshold: float = None,
+                       sparse_query: tuple = None, must_have_skills: list = None,
+                       min_experience_years: float = None) -> list:
+        """
+        Search for similar vectors. The query is scored against every named vector
+        and the per-vector results are combined with `aggregation` (defaults to
+        MATCH_AGGREGATION): "hybrid" fuses them with the `sparse_query` keyword
+        ranking server-side in a single query; max, mean or weighted combine dense
+        similarities from one batched request.
+        Returns up to top_k results after skipping `offset`, keeping only aggregated
+        scores >= score_threshold. Every named vector is searched for
+        (offset + top_k) * MATCH_SECTION_OVERSAMPLE hits, so deep offsets cost
+        proportionally more. must_have_skills (normalized keys) and
+        min_experience_years are indexed pre-filters applied inside the search.
+        Returns list of (id, score, metadata, section_scores).
+        """
+        aggregation = aggregation or settings.MATCH_AGGREGATION
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation '{aggregation}', expected one of {AGGREGATIONS}")
+        query_filter = self._build_filter(filter_metadata, must_have_skills, min_experience_years)
+        if aggregation == "hybrid":
+            return self._search_hybrid(query_embedding, sparse_query, top_k, query_filter, offset, score_threshold)
+
+        logger.info(f"Searching vectors with top_k={top_k}, offset={offset}, score_threshold={score_threshold}, filter={filter_metadata}, aggregation={aggregation}")
+        # Oversample per vector so a candidate strong on one section but not in another's top_k still ranks.
+        # Pages are cut after aggregation, so each vector is read from the start.
+        limit = (offset + top_k) * max(1, settings.MATCH_SECTION_OVERSAMPLE)
+        # The threshold applies to the aggregated score only: cutting per-vector
+        # pages at it would hide the real scores of weak sections
+        search_params = self.search_params()
+        responses = self.client.query_batch_points(
             collection_name=self.collection_name,
-            query=query_embedding,
-            limit=top_k,
-            query_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key=k,
-                        match=models.MatchValue(value=v)
-                    ) for k, v in (filter_metadata or {}).items()
-                ]
-            ),
-            with_payload=True
+            requests=[
+                models.QueryRequest(query=query_embedding, using=name, limit=limit, filter=query_filter,
+                                    params=search_params, with_payload=SEARCH_PAYLOAD)
+                for name in VECTOR_NAMES
+            ]
         )
-        
+
+        hits = {}
+        floors = {}
+        for name, response in zip(VECTOR_NAMES, responses):
+            for hit in response.points:
+                entry = hits.setdefault(hit.id, {"metadata": hit.payload, "scores": {}})
+                entry["scores"][name] = hit.score
+            # A full page means unseen points score at most the lowest returned score;
+            # a short one returned every point that has this vector
+            floors[name] = response.points[-1].score if len(response.points) == limit else 0.0
+
+        weights = _parse_weights(settings.MATCH_SECTION_WEIGHTS)
         results = []
-        for hit in response.points:
+        for point_id, entry in hits.items():
+            scores = dict(entry["scores"])
+            for name in entry["metadata"].get("vectors") or []:
+                if name not in scores and name in floors:
+                    scores[name] = floors[name]
             results.append({
-                "id": hit.id,
-                "score": hit.score,
-                "metadata": hit.payload
+                "id": point_id,
+                "score": self._aggregate(scores, aggregation, weights),
+                "metadata": entry["metadata"],
+                "section_scores": scores
             })
-        return results
 
-    def delete_embeddings_for_candidate(self, candidate_id: str):
-        # Implementation depends on storing candidate_id in payload
-        self.client.delete(
+        if score_threshold is not None:
+            results = [r for r in results if r["score"] >= score_threshold]
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[offset:offset + top_k]
+
+    def _search_hybrid(self, query_embedding: list[float], sparse_query: tuple, top_k: int,
+                       query_filter: models.Filter, offset: int, score_threshold: float) -> list:
+        """
+        One query: every dense section vector and the sparse keyword vector are
+        prefetched and fused server-side with weighted reciprocal rank fusion
+        (weights from MATCH_SECTION_WEIGHTS). Scores are normalized to 0-1, where
+        1 means ranked first by every source.
+        """
+        logger.info(f"Hybrid search with top_k={top_k}, offset={offset}, score_threshold={score_threshold}")
+        prefetch_limit = (offset + top_k) * max(1, settings.MATCH_SECTION_OVERSAMPLE)
+        prefetch, fusion, max_score = self._fusion_query(query_embedding, sparse_query, prefetch_limit, query_filter)
+        response = self.client.query_points(
             collection_name=self.collection_name,
-            points_selector=models.FilterSelector(
-                filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="candidate_id",
-                            match=models.MatchValue(value=candidate_id)
-                        )
-                    ]
+            prefetch=prefetch,
+            query=fusion,
+            query_filter=query_filter,
+            limit=top_k,
+            offset=offset,
+            score_threshold=score_threshold * max_score if score_threshold is not None else None,
+            with_payload=SEARCH_PAYLOAD
+        )
+        return [
+            {
+                "id": hit.id,
+                "score": hit.score / max_score,
+                "metadata": hit.payload,
+                "section_scores": {}  # rank fusion has no per-section similarity
+            }
+            for hit in response.points
+        ]
+
+    def _fusion_query(self, query_embedding: list[float], sparse_query: tuple, prefetch_limit: int,
+                      query_filter: models.Filter) -> tuple:
+        """
+        Prefetches (one per dense vector, plus the sparse keyword vector) and the
+        weighted RRF query fusing them. Also returns the fused score of a point
+        ranked first by every source, which normalizes scores to 0-1.
+        """
+        sources = [(name, query_embedding) for name in VECTOR_NAMES]
+        if sparse_query and sparse_query[0]:
+            indices, values = sparse_query
+            sources.append((SPARSE_VECTOR, models.SparseVector(indices=list(indices), values=list(values))))
+
+        weights = _parse_weights(settings.MATCH_SECTION_WEIGHTS)
+        source_weights = [weights.get(name, 1.0) for name, _ in sources]
+        k = settings.MATCH_RRF_K
+        # Fused score of a point ranked first by every source (Qdrant's weighted RRF)
+        max_score = sum(1 / (1 / w + k - 1) for w in source_weights if w > 0) or 1.0
+
+        search_params = self.search_params()
+        prefetch = [
+            models.Prefetch(query=query, using=name, limit=prefetch_limit, filter=query_filter,
+                            params=search_params if name in VECTOR_NAMES else None)
+            for name, query in sources
+        ]
+        return prefetch, models.RrfQuery(rrf=models.Rrf(k=k, weights=source_weights)), max_score
+
+    def search_talent_pool(self, query_embedding: list[float], sparse_query: tuple = None, limit: int = 20,
+                           score_threshold: float = None, must_have_skills: list = None,
+                           min_experience_years: float = None) -> list:
+        """
+        Searches every job's applications at once and groups hits by person_key
+        server-side, so each person appears once with their best-matching
+        application. Scored like hybrid match (normalized RRF of the section and
+        keyword rankings); score_threshold applies to that normalized score.
+        Returns list of {candidate_id, person_key, score, metadata} with the best
+        hit's payload (candidate_id is the best application's candidate).
+        """
+        logger.info(f"Talent search with limit={limit}, score_threshold={score_threshold}")
+        query_filter = self._build_filter(None, must_have_skills, min_experience_years)
+        # People with several applications take several prefetched slots
+        prefetch_limit = limit * max(1, settings.MATCH_SECTION_OVERSAMPLE) * max(1, settings.TALENT_SEARCH_OVERSAMPLE)
+        prefetch, fusion, max_score = self._fusion_query(query_embedding, sparse_query, prefetch_limit, query_filter)
+        response = self.client.query_points_groups(
+            collection_name=self.collection_name,
+            group_by="person_key",
+            prefetch=prefetch,
+            query=fusion,
+            query_filter=query_filter,
+            limit=limit,
+            group_size=1,
+            score_threshold=score_threshold * max_score if score_threshold is not None else None,
+            with_payload=SEARCH_PAYLOAD
+        )
+        return [
+            {
+                "candidate_id": group.hits[0].payload.get("candidate_id"),
+                "person_key": group.id,
+                "score": group.hits[0].score / max_score,
+                "metadata": group.hits[0].payload
+            }
+            for group in response.groups if group.hits
+        ]
+
+    @staticmethod
+    def _aggregate(scores: dict, aggregation: str, weights: dict) -> float:
+        if aggregation == "max":
+            return max(scores.values())
+        if aggregation == "mean":
+            return sum(scores.values()) / len(scores)
+        total_weight = sum(weights.get(name, 1.0) for name in scores)
+        if not total_weight:
+            return 0.0
+        return sum(weights.get(name, 1.0) * score for name, score in scores.items()) / total_weight
+
+    def delete_embeddings_for_candidate(self, candidate_id: str) -> set:
+        """
+        Deletes all points of a candidate. Returns the job IDs those points belonged
+        to, so callers can invalidate anything derived from those jobs' candidate pools.
+        """
+        # Implementation depends on storing candidate_id in payload
+        candidate_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="candidate_id",
+                    match=models.MatchValue(value=candidate_id)
                 )
-            )
+            ]
         )
+        job_ids = set()
+        # Every version: a collection being built or kept for rollback must not resurrect the candidate
+        client = self.client
+        collections = set(self.collection_versions().values()) | {self.collection_name}
+        for collection_name in sorted(collections):
+            offset = None
+            while True:
+                points, offset = client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=candidate_filter,
+                    limit=256,
+                    offset=offset,
+                    with_payload=["job_id"],
+                    with_vectors=False
+                )
+                job_ids.update(point.payload["job_id"] for point in points if point.payload.get("job_id"))
+                if offset is None:
+                    break
+
+            client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=candidate_filter)
+            )
+        return job_ids
+
+    def compact_duplicates(self, apply: bool = False, embedding_ids: Callable[[list], dict] = None) -> dict:
+        """
+        Finds applications with more than one point (left by random IDs on retries)
+        and, with apply=True, keeps one point per application under its
+        deterministic ID. The kept point is the one the application record
+        references: `embedding_ids(application_ids)` returns {application_id:
+        embedding_id} from the source of truth. Without a usable reference it is the
+        point already at the deterministic ID, else the most recently indexed one.
+        A kept point under another ID is re-keyed. Points without an
+        application_id are left alone.
+        Returns counts plus the affected job IDs and the re-keyed applications.
+        """
+        client = self.client
+        groups = {}
+        total = 0
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=self.collection_name,
+                limit=1024,
+                offset=offset,
+                with_payload=["application_id", "job_id", "indexed_at"],
+                with_vectors=False
+            )
+            total += len(points)
+            for point in points:
+                application_id = point.payload.get("application_id")
+                if application_id:
+                    groups.setdefault(application_id, []).append(point)
+            if offset is None:
+                break
+
+        applications = len(groups)
+        groups = {
+            application_id: points for application_id, points in groups.items()
+            if len(points) > 1 or str(points[0].id) != point_id(application_id)
+        }
+        referenced = embedding_ids(list(groups)) if embedding_ids and groups else {}
+
+        stats = {"points": total, "applications": applications, "duplicates": 0, "rekeyed": {}, "job_ids": set()}
+        to_delete = []
+        for application_id, points in groups.items():
+            target_id = point_id(application_id)
+            by_id = {str(p.id): p for p in points}
+            keep = by_id.get(str(referenced.get(application_id))) or by_id.get(target_id)
+            if keep is None:
+                keep = max(points, key=lambda p: p.payload.get("indexed_at") or 0)
+            if str(keep.id) != target_id:
+                stats["rekeyed"][application_id] = target_id
+            stats["duplicates"] += len(points) - 1
+            stats["job_ids"].update(p.payload["job_id"] for p in points if p.payload.get("job_id"))
+            if not apply:
+                continue
+            if str(keep.id) != target_id:
+                record = client.retrieve(self.collection_name, ids=[keep.id], with_payload=True, with_vectors=True)[0]
+                client.upsert(
+                    collection_name=self.collection_name,
+                    points=[models.PointStruct(id=target_id, vector=record.vector, payload=record.payload)],
+                    wait=True
+                )
+            to_delete.extend(p.id for p in points if str(p.id) != target_id)
+
+        for start in range(0, len(to_delete), 256):
+            client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.PointIdsList(points=to_delete[start:start + 256])
+            )
+        logger.info(f"Compaction of {self.collection_name}: {stats['duplicates']} duplicates, {len(stats['rekeyed'])} re-keyed, applied={apply}")
+        return stats
 
 vector_store = VectorStore()
@@ -1,164 +1,718 @@
 import os
-import tempfile
+import time
 import logging
 import json
-from rq import Queue
-from redis import Redis
+import threading
+import traceback
+from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from rq import Queue, SimpleWorker
+from rq.job import Job, JobStatus
+from rq.executions import Execution
+from rq.utils import now
 from appwrite.services.databases import Databases
 from appwrite.services.storage import Storage
+from appwrite.query import Query
 from .core.config import settings
 from .core.appwrite import appwrite_service
+from .core.redis_client import redis_conn
 from .core.logging_config import setup_logging
 from .services.gpt_parser import parser
+from .services.parse_cache import parse_cache
+from .services.match_cache import match_cache
 from .services.embeddings import embedding_service
-from .services.vector_store import vector_store
+from .services.vector_store import vector_store, point_id, person_key, RESUME_VECTOR, SECTION_VECTORS, SPARSE_VECTOR
+from .services.vector_migration import vector_migration
+from .services.sections import section_chunks
+from .services.sparse import bm25_encoder
+from .services.text_scan import scan_basics
+from .services.skills import normalize_skill
 from .schemas import CandidateCreate, Application
 
 # Determine if we should setup logging (running as worker)
 if os.getenv("RQ_WORKER_LOGGING") == "true":
     setup_logging()
 
-# Setup Redis connection
-redis_conn = Redis.from_url(settings.REDIS_URL)
+# Setup Redis queue
 queue = Queue('resumes', connection=redis_conn)
 
 logger = logging.getLogger(__name__)
 
-def parse_resume_and_index(application_id: str):
-    logger.info(f"Processing application: {application_id}")
-    
-    db = appwrite_service.get_database()
-    storage = appwrite_service.get_storage()
-    
-    try:
-        # 1. Get Application Document
-        application_doc = db.get_document(
+def _load_application(db, storage, application_id: str) -> dict:
+    """Fetches the application document and downloads its resume."""
+    # 1. Get Application Document
+    application_doc = db.get_document(
+        database_id=settings.DATABASE_ID,
+        collection_id=settings.APPLICATIONS_COLLECTION_ID,
+        document_id=application_id
+    )
+
+    resume_file_id = application_doc['resume_file_id']
+
+    # 2. Download Resume from Storage
+    # get_file_download returns bytes
+    file_bytes = storage.get_file_download(
+        bucket_id=settings.RESUMES_BUCKET_ID,
+        file_id=resume_file_id
+    )
+
+    # We need the extension to know how to parse
+    file_meta = storage.get_file(
+        bucket_id=settings.RESUMES_BUCKET_ID,
+        file_id=resume_file_id
+    )
+
+    return {
+        "application_id": application_id,
+        "candidate_id": application_doc['candidate_id'],
+        "job_id": application_doc['job_id'],
+        "resume_file_id": resume_file_id,
+        "filename": file_meta['name'],
+        "file_bytes": file_bytes
+    }
+
+def _parse_loaded(loaded_list: List[dict], executor: Optional[ThreadPoolExecutor] = None) -> List[dict]:
+    """
+    3. Parses downloaded resumes (identical files are parsed once via the parse cache).
+    Cache misses go through parser.parse_batch so several resumes share one LLM call;
+    extraction and single-resume fallbacks run on `executor` when given.
+    """
+    parse_mode = "llm" if parser.has_llm else "regex"
+    hashes = [parse_cache.hash_bytes(loaded['file_bytes']) for loaded in loaded_list]
+    parsed = [parse_cache.get(file_hash, parse_mode) for file_hash in hashes]
+
+    misses = {}
+    for i, (loaded, file_hash) in enumerate(zip(loaded_list, hashes)):
+        if parsed[i] is not None:
+            logger.info(f"Parse cache hit for {loaded['filename']} ({file_hash[:12]})")
+        else:
+            # Parsed straight from memory; no temp file to write or clean up
+            misses[str(i)] = (str(i), loaded['file_bytes'], loaded['filename'])
+
+    if misses:
+        results = parser.parse_batch(list(misses.values()), executor=executor)
+        for doc_id, parsed_data in results.items():
+            i = int(doc_id)
+            parsed[i] = parsed_data
+            # Don't persist a regex fallback produced by a transient LLM failure
+            if parse_mode == "regex" or parsed_data.get("extraction_method") != "regex":
+                parse_cache.set(hashes[i], parse_mode, parsed_data)
+    return parsed
+
+def _prepare_application(db, storage, application_id: str) -> Optional[dict]:
+    """
+    Downloads and parses the resume for an application and updates the candidate profile.
+    Returns everything needed to embed and index it, or None if parsing failed
+    (the application is already marked as failed in that case).
+    """
+    loaded = _load_application(db, storage, application_id)
+    parsed_data = _parse_loaded([loaded])[0]
+    return _finish_preparation(db, loaded, parsed_data)
+
+def _finish_preparation(db, loaded: dict, parsed_data: dict) -> Optional[dict]:
+    application_id = loaded['application_id']
+    candidate_id = loaded['candidate_id']
+    filename = loaded['filename']
+
+    if "error" in parsed_data:
+        logger.error(f"Parsing error: {parsed_data['error']}")
+        db.update_document(
             database_id=settings.DATABASE_ID,
             collection_id=settings.APPLICATIONS_COLLECTION_ID,
-            document_id=application_id
-        )
-        
-        resume_file_id = application_doc['resume_file_id']
-        candidate_id = application_doc['candidate_id']
-        job_id = application_doc['job_id']
-        
-        # 2. Download Resume from Storage
-        # get_file_download returns bytes
-        file_bytes = storage.get_file_download(
-            bucket_id=settings.RESUMES_BUCKET_ID,
-            file_id=resume_file_id
-        )
-        
-        # Save to temp file for parser
-        # We need the extension to know how to parse
-        file_meta = storage.get_file(
-            bucket_id=settings.RESUMES_BUCKET_ID,
-            file_id=resume_file_id
+            document_id=application_id,
+            data={"status": "failed", "parsed_summary": json.dumps({"error": parsed_data["error"]})}
         )
-        filename = file_meta['name']
-        ext = os.path.splitext(filename)[1]
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp_file:
-            tmp_file.write(file_bytes)
-            tmp_path = tmp_file.name
-            
-        # 3. Parse Resume
-        logger.info(f"Parsing file: {tmp_path}")
-        parsed_data = parser.parse(tmp_path)
-        
-        # Cleanup temp file
-        os.remove(tmp_path)
-        
-        if "error" in parsed_data:
-            logger.error(f"Parsing error: {parsed_data['error']}")
-            db.update_document(
-                database_id=settings.DATABASE_ID,
-                collection_id=settings.APPLICATIONS_COLLECTION_ID,
-                document_id=application_id,
-                data={"status": "failed", "parsed_summary": json.dumps({"error": parsed_data["error"]})}
-            )
-            return
+        return None
+
+    # 4. Update Candidate Profile (if fields empty)
+    candidate_doc = db.get_document(
+        database_id=settings.DATABASE_ID,
+        collection_id=settings.CANDIDATES_COLLECTION_ID,
+        document_id=candidate_id
+    )
+
+    update_data = {}
+    if not candidate_doc.get('email') and parsed_data.get('email'):
+        update_data['email'] = parsed_data['email']
+    if not candidate_doc.get('phone') and parsed_data.get('phone'):
+        update_data['phone'] = parsed_data['phone']
+    if not candidate_doc.get('name') or candidate_doc.get('name') == filename: # Update if name is just filename
+         if parsed_data.get('name'):
+            update_data['name'] = parsed_data['name']
+
+    # Merge skills
+    existing_skills = candidate_doc.get('skills', []) or []
+    new_skills = parsed_data.get('skills', [])
+    combined_skills = list(set(existing_skills + new_skills))
+    if combined_skills:
+        update_data['skills'] = combined_skills
 
-        # 4. Update Candidate Profile (if fields empty)
-        candidate_doc = db.get_document(
+    if parsed_data.get('experience_years'):
+         # Update if experience is 0 or not present
+         if not candidate_doc.get('experience_years'):
+             update_data['experience_years'] = float(parsed_data['experience_years'])
+
+    if parsed_data.get('summary'):
+         if not candidate_doc.get('summary'):
+             update_data['summary'] = parsed_data['summary']
+
+    if update_data:
+        db.update_document(
             database_id=settings.DATABASE_ID,
             collection_id=settings.CANDIDATES_COLLECTION_ID,
-            document_id=candidate_id
+            document_id=candidate_id,
+            data=update_data
         )
-        
-        update_data = {}
-        if not candidate_doc.get('email') and parsed_data.get('email'):
-            update_data['email'] = parsed_data['email']
-        if not candidate_doc.get('phone') and parsed_data.get('phone'):
-            update_data['phone'] = parsed_data['phone']
-        if not candidate_doc.get('name') or candidate_doc.get('name') == filename: # Update if name is just filename
-             if parsed_data.get('name'):
-                update_data['name'] = parsed_data['name']
-        
-        # Merge skills
-        existing_skills = candidate_doc.get('skills', []) or []
-        new_skills = parsed_data.get('skills', [])
-        combined_skills = list(set(existing_skills + new_skills))
-        if combined_skills:
-            update_data['skills'] = combined_skills
-            
-        if parsed_data.get('experience_years'):
-             # Update if experience is 0 or not present
-             if not candidate_doc.get('experience_years'):
-                 update_data['experience_years'] = float(parsed_data['experience_years'])
-
-        if parsed_data.get('summary'):
-             if not candidate_doc.get('summary'):
-                 update_data['summary'] = parsed_data['summary']
-
-        if update_data:
-            db.update_document(
-                database_id=settings.DATABASE_ID,
-                collection_id=settings.CANDIDATES_COLLECTION_ID,
-                document_id=candidate_id,
-                data=update_data
-            )
 
-        # 5. Generate Embedding
-        # Embed the raw text or the summary? Plan says resume text.
-        text_to_embed = parsed_data.get('raw_text', '') or parsed_data.get('summary', '') or " "
-        embedding = embedding_service.generate_embedding(text_to_embed)
-        
-        # 6. Upsert to Qdrant
-        metadata = {
-            "candidate_id": candidate_id,
-            "application_id": application_id,
-            "job_id": job_id,
-            "resume_file_id": resume_file_id,
-            "skills": combined_skills,
-            "experience_years": parsed_data.get('experience_years', 0)
+    text_to_embed = _text_to_embed(parsed_data)
+
+    return {
+        "application_id": application_id,
+        "candidate_id": candidate_id,
+        "job_id": loaded['job_id'],
+        "resume_file_id": loaded['resume_file_id'],
+        "parsed_data": parsed_data,
+        "combined_skills": combined_skills,
+        "text": text_to_embed,
+        "embedding_groups": _embedding_groups(text_to_embed),
+        "sparse_vector": bm25_encoder.encode_document(text_to_embed)
+    }
+
+def _text_to_embed(parsed_data: dict) -> str:
+    # Embed the raw text or the summary? Plan says resume text.
+    return parsed_data.get('raw_text', '') or parsed_data.get('summary', '') or " "
+
+def _embedding_groups(text: str) -> dict:
+    """
+    Chunks a resume to the embedding model's input size, grouped by named vector:
+    one group per section in SECTION_VECTORS plus RESUME_VECTOR covering every chunk.
+    Each group is mean-pooled into one vector, so long sections are embedded in full
+    instead of being silently truncated.
+    """
+    chunks = section_chunks(text, settings.EMBEDDING_CHUNK_CHARS)
+    groups = {name: chunks[name] for name in SECTION_VECTORS if name in chunks}
+    groups[RESUME_VECTOR] = [chunk for section in chunks.values() for chunk in section] or [text[:settings.EMBEDDING_CHUNK_CHARS]]
+    return groups
+
+def _point_metadata(prepared: dict) -> dict:
+    return {
+        "candidate_id": prepared['candidate_id'],
+        # Talent search groups on this: one candidate document exists per application
+        "person_key": person_key(prepared['candidate_id'], prepared['parsed_data'].get('email')),
+        "application_id": prepared['application_id'],
+        "job_id": prepared['job_id'],
+        "resume_file_id": prepared['resume_file_id'],
+        "skills": prepared['combined_skills'],
+        # Normalized keys behind the indexed must-have-skills filter
+        "skill_keys": sorted({normalize_skill(skill) for skill in prepared['combined_skills'] if skill}),
+        "experience_years": float(prepared['parsed_data'].get('experience_years') or 0),
+        # Source for re-embedding when the embedding model changes (see vector_migration.py)
+        "text": prepared['text'],
+        "indexed_at": time.time()
+    }
+
+def _point_vectors(prepared: dict, dense_vectors: dict) -> dict:
+    # Dense section vectors plus the sparse keyword vector used by hybrid search
+    return {**dense_vectors, SPARSE_VECTOR: prepared['sparse_vector']}
+
+def _mark_processed(db, prepared: dict, vector_id: str):
+    # 7. Update Application Status
+    db.update_document(
+        database_id=settings.DATABASE_ID,
+        collection_id=settings.APPLICATIONS_COLLECTION_ID,
+        document_id=prepared['application_id'],
+        data={
+            "status": "processed",
+            "parsed_summary": json.dumps(prepared['parsed_data'].get('summary', '')),
+            "embedding_id": vector_id
         }
-        
-        vector_id = vector_store.upsert_embedding(embedding, metadata)
-        
-        # 7. Update Application Status
-        db.update_document(
+    )
+
+def _index_application(db, prepared: dict, vectors: dict):
+    """
+    Upserts the named vectors for a prepared application and marks it as processed.
+    """
+    # 6. Upsert to Qdrant
+    vector_id = vector_store.upsert_embedding(_point_vectors(prepared, vectors), _point_metadata(prepared))
+    # The job's candidate pool changed: cached rankings for it are stale
+    match_cache.invalidate([prepared['job_id']])
+    _mark_processed(db, prepared, vector_id)
+
+def _mark_application_error(db, application_id: str, error: Exception):
+    logger.error(f"Error processing application {application_id}: {error}")
+    # Update status to error
+    try:
+         db.update_document(
             database_id=settings.DATABASE_ID,
             collection_id=settings.APPLICATIONS_COLLECTION_ID,
             document_id=application_id,
-            data={
-                "status": "processed",
-                "parsed_summary": json.dumps(parsed_data.get('summary', '')),
-                "embedding_id": vector_id
-            }
+            data={"status": "error"}
         )
-        
+    except Exception:
+        pass
+
+def parse_resume_and_index(application_id: str):
+    logger.info(f"Processing application: {application_id}")
+
+    db = appwrite_service.get_database()
+    storage = appwrite_service.get_storage()
+
+    try:
+        prepared = _prepare_application(db, storage, application_id)
+        if prepared is None:
+            return
+
+        # 5. Generate Embeddings (all sections in one batched call)
+        vectors = embedding_service.generate_pooled_embeddings([prepared['embedding_groups']])[0]
+        if RESUME_VECTOR not in vectors:
+            raise Exception("Embedding generation failed")
+
+        _index_application(db, prepared, vectors)
+
         logger.info(f"Successfully processed application {application_id}")
 
     except Exception as e:
-        logger.error(f"Error processing application {application_id}: {e}")
-        # Update status to error
+        _mark_application_error(db, application_id, e)
+
+def remove_candidate_from_index(candidate_id: str):
+    """
+    Deletes every indexed point for a candidate and invalidates cached match
+    results for the jobs they had applied to.
+    """
+    job_ids = vector_store.delete_embeddings_for_candidate(candidate_id)
+    match_cache.invalidate(job_ids)
+    logger.info(f"Removed candidate {candidate_id} from the index ({len(job_ids)} jobs affected)")
+
+def _reembed_records(records: list) -> list:
+    """
+    Re-embeds scrolled points with the current embedding settings, from the resume
+    text stored in their payload. Points indexed before the text was stored are
+    re-downloaded and parsed (the parse cache makes repeats cheap).
+    skill_keys are recomputed, indexed_at stamped and a missing person_key derived
+    from the resume's email, so migrated legacy points match the skill and
+    indexed_at filters and group in talent search.
+    Returns (point id, named vectors, metadata) for every point that embedded.
+    When an application has duplicate points, the last one scrolled wins.
+    """
+    texts = {record.id: record.payload.get('text') for record in records if record.payload.get('text')}
+    parsed_skills = {}
+    missing = [record for record in records if record.id not in texts]
+    if missing:
+        db = appwrite_service.get_database()
+        storage = appwrite_service.get_storage()
+        loaded_list, loaded_ids = [], []
+        for record in missing:
+            try:
+                loaded_list.append(_load_application(db, storage, record.payload['application_id']))
+                loaded_ids.append(record.id)
+            except Exception as e:
+                logger.warning(f"Cannot re-embed point {record.id}: loading its resume failed: {e}")
+        if loaded_list:
+            for record_id, parsed_data in zip(loaded_ids, _parse_loaded(loaded_list)):
+                if "error" not in parsed_data:
+                    texts[record_id] = _text_to_embed(parsed_data)
+                    parsed_skills[record_id] = parsed_data.get('skills') or []
+
+    records = [record for record in records if record.id in texts]
+    pooled = embedding_service.generate_pooled_embeddings([_embedding_groups(texts[record.id]) for record in records])
+    items = []
+    for record, dense_vectors in zip(records, pooled):
+        if RESUME_VECTOR not in dense_vectors:
+            logger.warning(f"Cannot re-embed point {record.id}: embedding generation failed")
+            continue
+        text = texts[record.id]
+        metadata = {key: value for key, value in record.payload.items() if key != "vectors"}
+        metadata["text"] = text
+        # Bring payloads from before the skill filter / catch-up up to date
+        skills = metadata.get("skills") or parsed_skills.get(record.id) or []
+        metadata["skill_keys"] = sorted({normalize_skill(skill) for skill in skills if skill})
+        metadata["indexed_at"] = time.time()
+        if not metadata.get("person_key") and metadata.get("candidate_id"):
+            metadata["person_key"] = person_key(metadata["candidate_id"], scan_basics(text).email)
+        # Re-keyed to the deterministic ID, so duplicates of an application collapse into one point
+        new_id = point_id(metadata['application_id']) if metadata.get('application_id') else record.id
+        items.append((new_id, {**dense_vectors, SPARSE_VECTOR: bm25_encoder.encode_document(text)}, metadata))
+    return items
+
+def migrate_vector_collection(swap: bool = True) -> dict:
+    """
+    Re-embeds the live collection into a new versioned collection with this
+    process's embedding settings and swaps the alias (resumes an interrupted run).
+    """
+    return vector_migration.run(_reembed_records, embedding_service.get_dimension(), swap=swap)
+
+def catch_up_vector_migration() -> dict:
+    """Copies writes made to the old collection since the last migration pass."""
+    return vector_migration.catch_up(_reembed_records)
+
+def parse_resumes_and_index_batch(application_ids: List[str]):
+    """
+    Processes several applications in one job: resumes are downloaded in parallel
+    (WORKER_CONCURRENCY threads), parsed with batched LLM calls, embedded in a
+    single batched call, written to Qdrant with one upsert, and their status
+    documents updated concurrently.
+    Returns {application_id: error} for the applications that were not indexed
+    (each is also marked on its application document).
+    """
+    logger.info(f"Processing batch of {len(application_ids)} applications")
+
+    db = appwrite_service.get_database()
+    storage = appwrite_service.get_storage()
+    failures = {}
+
+    def fail(application_id: str, error: Exception):
+        failures[application_id] = str(error)
+        _mark_application_error(db, application_id, error)
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.WORKER_CONCURRENCY)) as executor:
+        # 1-2. Fetch application documents and download resumes in parallel
+        futures = {
+            executor.submit(_load_application, db, storage, application_id): application_id
+            for application_id in application_ids
+        }
+        loaded_list = []
+        for future, application_id in futures.items():
+            try:
+                loaded_list.append(future.result())
+            except Exception as e:
+                fail(application_id, e)
+
+        if not loaded_list:
+            return failures
+
+        # 3. Parse in parallel; only the LLM call is shared by several resumes
+        try:
+            parsed_list = _parse_loaded(loaded_list, executor)
+        except Exception as e:
+            for loaded in loaded_list:
+                fail(loaded['application_id'], e)
+            return failures
+
+        # 4. Update candidate profiles in parallel
+        futures = {
+            executor.submit(_finish_preparation, db, loaded, parsed_data): loaded['application_id']
+            for loaded, parsed_data in zip(loaded_list, parsed_list)
+        }
+        prepared_list = []
+        for future, application_id in futures.items():
+            try:
+                prepared = future.result()
+                if prepared is not None:
+                    prepared_list.append(prepared)
+                else:
+                    # Already marked failed on the application document
+                    failures[application_id] = "Resume parsing failed"
+            except Exception as e:
+                fail(application_id, e)
+
+        if not prepared_list:
+            return failures
+
+        # 5. One batched embedding call for every section of every resume in the batch
+        embeddings = embedding_service.generate_pooled_embeddings([p['embedding_groups'] for p in prepared_list])
+
+        to_index = []
+        for prepared, vectors in zip(prepared_list, embeddings):
+            if RESUME_VECTOR in vectors:
+                to_index.append((prepared, vectors))
+            else:
+                fail(prepared['application_id'], Exception("Embedding generation failed"))
+
+        if not to_index:
+            return failures
+
+        # 6. Single Qdrant upsert for all points
+        try:
+            vector_ids = vector_store.upsert_embeddings(
+                [(_point_vectors(prepared, vectors), _point_metadata(prepared)) for prepared, vectors in to_index]
+            )
+            match_cache.invalidate(prepared['job_id'] for prepared, _ in to_index)
+        except Exception as e:
+            for prepared, _ in to_index:
+                fail(prepared['application_id'], e)
+            return failures
+
+        # 7. Status updates fan out concurrently (Appwrite has no per-document bulk update)
+        status_futures = {
+            executor.submit(_mark_processed, db, prepared, vector_id): prepared['application_id']
+            for (prepared, _), vector_id in zip(to_index, vector_ids)
+        }
+        indexed = 0
+        for future, application_id in status_futures.items():
+            try:
+                future.result()
+                indexed += 1
+            except Exception as e:
+                fail(application_id, e)
+
+    logger.info(f"Batch complete: {indexed}/{len(application_ids)} applications indexed")
+    return failures
+
+# --- Batch enqueue / cancel / requeue ---
+
+def _batch_jobs_key(batch_id: str) -> str:
+    return f"batch:{batch_id}:jobs"
+
+def enqueue_batch(application_ids: List[str], batch_id: str) -> List[str]:
+    """
+    Enqueues parsing for every application in a batch using pipelined Redis writes
+    (one round trip per ENQUEUE_PIPELINE_SIZE jobs). Each job carries the batch_id in
+    its meta and is tracked in a per-batch set so the batch can be cancelled or
+    re-queued as a group. Returns the RQ job IDs.
+    """
+    # Applications are grouped WORKER_BATCH_SIZE per job so the worker can parse,
+    # embed and upsert them together (parse_resumes_and_index_batch)
+    group_size = max(1, settings.WORKER_BATCH_SIZE)
+    groups = [application_ids[i:i + group_size] for i in range(0, len(application_ids), group_size)]
+
+    job_ids = []
+    step = max(1, settings.ENQUEUE_PIPELINE_SIZE)
+    for start in range(0, len(groups), step):
+        chunk = groups[start:start + step]
+        job_datas = [
+            Queue.prepare_data(parse_resumes_and_index_batch, args=(group,), meta={"batch_id": batch_id})
+            for group in chunk
+        ]
+        with redis_conn.pipeline() as pipe:
+            jobs = queue.enqueue_many(job_datas, pipeline=pipe)
+            pipe.sadd(_batch_jobs_key(batch_id), *[job.id for job in jobs])
+            pipe.expire(_batch_jobs_key(batch_id), settings.BATCH_TRACKING_TTL_SECONDS)
+            pipe.execute()
+        job_ids.extend(job.id for job in jobs)
+
+    logger.info(f"Enqueued {len(application_ids)} applications in {len(job_ids)} jobs for batch {batch_id}")
+    return job_ids
+
+def _fetch_batch_jobs(batch_id: str) -> list:
+    job_ids = [job_id.decode() for job_id in redis_conn.smembers(_batch_jobs_key(batch_id))]
+    return [job for job in Job.fetch_many(job_ids, connection=redis_conn) if job is not None]
+
+def _job_application_ids(job: Job) -> List[str]:
+    ids = job.args[0]
+    return ids if isinstance(ids, list) else [ids]
+
+def _list_batch_applications(db, batch_id: str, statuses: List[str]) -> List[str]:
+    """IDs of the batch's applications whose Appwrite status is one of `statuses` (needs idx_batch)."""
+    application_ids = []
+    cursor = None
+    while True:
+        queries = [Query.equal("batch_id", batch_id), Query.equal("status", statuses), Query.limit(100)]
+        if cursor:
+            queries.append(Query.cursor_after(cursor))
+        result = db.list_documents(
+            database_id=settings.DATABASE_ID,
+            collection_id=settings.APPLICATIONS_COLLECTION_ID,
+            queries=queries
+        )
+        documents = result['documents']
+        application_ids.extend(doc['$id'] for doc in documents)
+        if len(documents) < 100:
+            return application_ids
+        cursor = documents[-1]['$id']
+
+def _set_application_status(db, application_ids: List[str], status: str):
+    """Sets the status of many applications concurrently (Appwrite has no bulk update)."""
+    def update(application_id):
         try:
-             db.update_document(
+            db.update_document(
                 database_id=settings.DATABASE_ID,
                 collection_id=settings.APPLICATIONS_COLLECTION_ID,
                 document_id=application_id,
-                data={"status": "error"}
+                data={"status": status}
             )
-        except Exception:
-            pass
+        except Exception as e:
+            logger.error(f"Failed to mark application {application_id} as {status}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.WORKER_CONCURRENCY)) as executor:
+        list(executor.map(update, application_ids))
+
+def cancel_batch(batch_id: str) -> int:
+    """
+    Cancels every job of the batch that is still waiting in the queue and marks its
+    applications "cancelled", so they don't stay "pending". Returns the number of
+    cancelled applications.
+    """
+    cancelled_ids = []
+    for job in _fetch_batch_jobs(batch_id):
+        if job.get_status() in (JobStatus.QUEUED, JobStatus.DEFERRED, JobStatus.SCHEDULED):
+            job.cancel()
+            cancelled_ids.extend(_job_application_ids(job))
+    _set_application_status(appwrite_service.get_database(), cancelled_ids, "cancelled")
+    logger.info(f"Cancelled {len(cancelled_ids)} applications for batch {batch_id}")
+    return len(cancelled_ids)
+
+def requeue_batch(batch_id: str) -> int:
+    """
+    Re-enqueues the applications of a batch that did not get indexed, selected by
+    their Appwrite status (error, failed, cancelled, or pending without a live job).
+    The tasks catch their own errors, so a failed parse still ends its RQ job as
+    FINISHED; the job status alone can't tell what needs a retry. Returns the count.
+    """
+    in_flight = set()
+    stale_job_ids = []
+    for job in _fetch_batch_jobs(batch_id):
+        if job.get_status() in (JobStatus.QUEUED, JobStatus.DEFERRED, JobStatus.SCHEDULED, JobStatus.STARTED):
+            in_flight.update(_job_application_ids(job))
+        else:
+            stale_job_ids.append(job.id)
+
+    db = appwrite_service.get_database()
+    retry_ids = [
+        application_id
+        for application_id in _list_batch_applications(db, batch_id, ["error", "failed", "cancelled", "pending"])
+        if application_id not in in_flight
+    ]
+    if stale_job_ids:
+        redis_conn.srem(_batch_jobs_key(batch_id), *stale_job_ids)
+    if not retry_ids:
+        return 0
+    _set_application_status(db, retry_ids, "pending")
+    enqueue_batch(retry_ids, batch_id)
+    return len(retry_ids)
+
+# --- Micro-batching worker ---
+# Jobs go through RQ's own lifecycle (execution in StartedJobRegistry, status,
+# result, failure registry), so a crashed micro-batch worker leaves its jobs to
+# be recovered by RQ's registry maintenance instead of silently dropping them.
+
+def _start_job(worker: SimpleWorker, job: Job) -> Execution:
+    """Registers a dequeued job as started: status, heartbeat and StartedJobRegistry entry."""
+    execution = worker.prepare_execution(job)
+    worker.prepare_job_execution(job, remove_from_intermediate_queue=True)
+    job.started_at = now()
+    return execution
+
+def _finish_job(worker: SimpleWorker, job: Job, execution: Execution, result=None, exc_string: str = None):
+    """Records a started job's outcome the way RQ's worker does (result/failure registries, counters)."""
+    worker.execution = execution # handle_job_* clean up the worker's current execution
+    job.ended_at = now()
+    if exc_string is None:
+        job._result = result
+        job._status = JobStatus.FINISHED
+        worker.handle_job_success(job=job, queue=queue, started_job_registry=queue.started_job_registry)
+    else:
+        job._status = JobStatus.FAILED
+        worker.handle_job_failure(job=job, queue=queue, started_job_registry=queue.started_job_registry, exc_string=exc_string)
+
+def _heartbeat_jobs(worker: SimpleWorker, started: list, lock: threading.Lock, stop: threading.Event):
+    # Keeps started executions alive until they finish; otherwise RQ treats them as abandoned
+    while not stop.wait(worker.job_monitoring_interval):
+        try:
+            with lock:
+                waiting = list(started)
+            with redis_conn.pipeline() as pipeline:
+                worker.heartbeat(worker.job_monitoring_interval + 60, pipeline=pipeline)
+                for job, execution in waiting:
+                    ttl = worker.get_heartbeat_ttl(job)
+                    execution.heartbeat(job.started_job_registry, ttl, pipeline=pipeline)
+                    job.heartbeat(now(), ttl, pipeline=pipeline, xx=True)
+                pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Micro-batch heartbeat failed: {e}")
+
+def _collect_micro_batch(worker: SimpleWorker, batch_size: int, wait_seconds: float) -> list:
+    """
+    Dequeues up to batch_size jobs and marks each as started right away. Blocks
+    until the first job arrives, then waits at most wait_seconds for the batch
+    to fill up. Returns (job, execution) pairs.
+    """
+    started = []
+    deadline = None
+    while len(started) < batch_size:
+        if deadline is None:
+            timeout = 5 # Idle poll interval
+        else:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            timeout = max(1, int(remaining)) # BLPOP timeouts are whole seconds
+
+        result = worker.dequeue_job_and_maintain_ttl(timeout, max_idle_time=timeout)
+        if result is None:
+            if started:
+                break
+            continue
+
+        job, _ = result
+        started.append((job, _start_job(worker, job)))
+        if deadline is None:
+            deadline = time.monotonic() + wait_seconds
+    return started
+
+def _batch_timeout(jobs: list) -> Optional[int]:
+    """Longest job timeout in the batch; None when any job may run forever (-1)."""
+    timeouts = [job.timeout or queue.DEFAULT_TIMEOUT for job in jobs]
+    return None if any(t == -1 for t in timeouts) else max(timeouts)
+
+def _run_micro_batch(worker: SimpleWorker, started: list):
+    # Every started job is heartbeated from here until it finishes, including
+    # batched ones waiting while other jobs run
+    pending = list(started)
+    lock = threading.Lock()
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat_jobs, args=(worker, pending, lock, stop), daemon=True)
+    heartbeat.start()
+    try:
+        batch = []
+        for job, execution in started:
+            if job.func_name.rsplit(".", 1)[-1] == parse_resume_and_index.__name__:
+                batch.append((job, execution))
+                continue
+            # Anything else on the queue runs as a normal job (with its own timeout)
+            with lock:
+                pending.remove((job, execution))
+            worker.execution = execution
+            worker.perform_job(job, queue)
+
+        if not batch:
+            return
+
+        # The batch runs on its own thread so job.timeout can be enforced; a batch
+        # that overruns is failed and left to finish in the background (points are
+        # keyed by application, so a late write is harmless)
+        timeout = _batch_timeout([job for job, _ in batch])
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(parse_resumes_and_index_batch, [job.args[0] for job, _ in batch])
+            failures = future.result(timeout=timeout)
+        except Exception as e:
+            if isinstance(e, FuturesTimeoutError):
+                exc_string = f"Micro-batch exceeded the job timeout ({timeout}s)"
+            else:
+                exc_string = traceback.format_exc()
+            logger.error(f"Micro-batch of {len(batch)} jobs failed: {exc_string}")
+            for job, execution in batch:
+                _finish_job(worker, job, execution, exc_string=exc_string)
+            return
+        finally:
+            executor.shutdown(wait=False)
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    # Each job succeeds or fails with its own application's outcome
+    for job, execution in batch:
+        application_id = job.args[0]
+        if application_id in failures:
+            _finish_job(worker, job, execution, exc_string=f"Application {application_id} was not indexed: {failures[application_id]}")
+        else:
+            _finish_job(worker, job, execution, result=application_id)
+
+def run_micro_batch_worker(batch_size: int = None, wait_seconds: float = None):
+    """
+    Alternative to `rq worker`: collects pending applications from the 'resumes' queue
+    into micro-batches so embedding throughput scales with batch size, not job count.
+    """
+    batch_size = batch_size or settings.WORKER_MICRO_BATCH_SIZE
+    wait_seconds = settings.WORKER_MICRO_BATCH_WAIT_SECONDS if wait_seconds is None else wait_seconds
+    logger.info(f"Starting micro-batch worker (batch_size={batch_size}, wait={wait_seconds}s)")
+
+    worker = SimpleWorker([queue], connection=redis_conn)
+    worker.register_birth()
+    try:
+        while True:
+            started = _collect_micro_batch(worker, batch_size, wait_seconds)
+            if started:
+                _run_micro_batch(worker, started)
+    finally:
+        worker.register_death()
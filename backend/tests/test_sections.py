@@ -0,0 +1,75 @@
+import os
+import sys
+import pytest
+from datetime import date
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.sections import _match_header, segment_sections
+
+@pytest.mark.parametrize("line, section", [
+    ("Experience", "experience"),
+    ("EDUCATION", "education"),
+    ("Skills:", "skills"),
+    ("## Projects", "projects"),
+    ("Professional Experience", "experience"),
+    ("Work Experience", "experience"),
+    ("Key Technical Skills", "skills"),
+    ("Skills & Tools", "skills"),
+    ("Education and Training", "education"),
+    ("RELEVANT PROJECTS", "projects"),
+    ("Relevant projects:", "projects"),
+    ("References", "other"),
+])
+def test_headings(line, section):
+    assert _match_header(line) == section
+
+@pytest.mark.parametrize("line", [
+    "Experience with AWS",
+    "5 years experience",
+    "Relevant projects",
+    "Led the education outreach program",
+    "Summary of achievements in Q3 planning",
+    "",
+])
+def test_content_lines_are_not_headings(line):
+    assert _match_header(line) is None
+
+def test_content_stays_in_its_section():
+    text = "\n".join([
+        "Jane Doe",
+        "Experience",
+        "Backend Engineer 2019 - 2023",
+        "Experience with AWS",
+        "5 years experience",
+        "Relevant projects",
+        "Skills",
+        "Python, Go",
+    ])
+    sections = segment_sections(text)
+    assert sections["header"] == "Jane Doe"
+    assert sections["experience"].split("\n") == [
+        "Backend Engineer 2019 - 2023",
+        "Experience with AWS",
+        "5 years experience",
+        "Relevant projects",
+    ]
+    assert "projects" not in sections
+    assert sections["skills"] == "Python, Go"
+
+def test_experience_years_ignore_education_dates():
+    from app.services.gpt_parser import parser
+    text = "\n".join([
+        "Jane Doe",
+        "Experience",
+        "Senior Engineer 2020 - present",
+        "Engineer 2018 - 2020",
+        "Education",
+        "BSc Computer Science 2012 - 2016",
+    ])
+    data, confidence = parser._extract_deterministic(text)
+    assert data["experience_years"] == date.today().year - 2018
+    assert confidence["experience_years"] == 0.8
+
+    data, confidence = parser._extract_deterministic("Jane Doe\nEducation\nBSc 2012 - 2016")
+    assert confidence["experience_years"] == 0.0
@@ -0,0 +1,29 @@
+import os
+import sys
+import pytest
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.skills import SkillMatcher
+
+matcher = SkillMatcher({
+    "C": ["ansi c", "c language"],
+    "C++": ["cpp"],
+    "R": ["r programming"],
+    "Java": [],
+    "JavaScript": ["js"],
+})
+
+@pytest.mark.parametrize("text, skills", [
+    ("Languages: C, Python", ["C"]),
+    ("C/C++ and Java", ["C", "C++", "Java"]),
+    ("Python, R, SQL", ["R"]),
+    ("Statistics in R programming", ["R"]),
+    ("Embedded work in the C language", ["C"]),
+    ("Led R&D for Plan C", []),
+    ("See Section C of the report", []),
+    ("Java and JavaScript", ["Java", "JavaScript"]),
+    ("cpp, c", ["C++"]),
+])
+def test_find(text, skills):
+    assert matcher.find(text) == skills
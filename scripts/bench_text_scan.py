@@ -0,0 +1,112 @@
+"""
+Micro-benchmark for the regex layer (text cleaning + email/phone/links/date ranges).
+Compares the previous per-field re.search/re.sub/re.findall calls against the
+precompiled single-pass scanner in app/services/text_scan.py.
+
+    python scripts/bench_text_scan.py --sample-dir ./resume_texts   # directory of .txt dumps
+    python scripts/bench_text_scan.py --synthetic 10000
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services.text_scan import clean_text, scan_basics
+
+def legacy_basics(text):
+    # The pre-scanner implementation, kept verbatim for comparison
+    text = text.replace("\t", " ")
+    text = re.sub(r"[•●▪]", "-", text)
+    text = re.sub(r"\n{2,}", "\n\n", text)
+    text = text.strip()
+    email = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
+    phone = re.search(r"(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
+    links = re.findall(r"(https?://\S+)", text)
+    # Date ranges were scanned twice per parse (regex fallback + deterministic tier)
+    date_ranges = re.findall(r"(20\d{2})\s*-\s*(present|20\d{2})", text.lower())
+    re.findall(r"(20\d{2})\s*-\s*(present|20\d{2})", text.lower())
+    return email and email.group(0), phone and phone.group(0), links, date_ranges
+
+def scanner_basics(text):
+    scan_basics.cache_clear() # measure the scan itself, not cache hits
+    text = clean_text(text)
+    scanned = scan_basics(text)
+    scan_basics(text) # second consumer, as in a real parse
+    return scanned.email, scanned.phone, list(scanned.links), list(scanned.date_ranges)
+
+WORDS = (
+    "engineered scalable services using python docker kubernetes led team of five "
+    "migrated legacy platform reduced latency by percent customers stakeholders "
+    "designed data pipelines mentored analysts delivered roadmap"
+).split()
+
+def synthetic_resume(i: int, rng: random.Random) -> str:
+    lines = [f"Candidate {i}"]
+    # Not every resume has a US-style phone number or an email: those are the slow cases
+    if rng.random() < 0.8:
+        lines.append(f"candidate{i}@example.com")
+    lines.append(f"+1 (555) 123-{i % 10000:04d}" if rng.random() < 0.7 else f"+44 20 7946 {i % 1000:03d}")
+    lines.append(f"https://linkedin.com/in/candidate{i}")
+    lines += ["", "", "Summary", " ".join(rng.choices(WORDS, k=40)), "", "Experience"]
+    for start in sorted(rng.sample(range(2005, 2023), 3)):
+        end = "Present" if start > 2020 else str(start + rng.randint(1, 3))
+        lines.append(f"Company {start}\t{start} - {end}")
+        lines += [f"• {' '.join(rng.choices(WORDS, k=14))}" for _ in range(rng.randint(4, 12))]
+    lines += ["", "Skills", ", ".join(rng.choices(WORDS, k=20))]
+    return "\n".join(lines)
+
+def load_sample(sample_dir: str):
+    texts = []
+    for name in sorted(os.listdir(sample_dir)):
+        if name.lower().endswith(".txt"):
+            with open(os.path.join(sample_dir, name), encoding="utf-8", errors="replace") as f:
+                texts.append(f.read())
+    return texts
+
+def bench(fn, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the resume regex layer")
+    ap.add_argument("--sample-dir", help="Directory of extracted resume texts (*.txt)")
+    ap.add_argument("--synthetic", type=int, default=10000, help="Number of synthetic resumes when no sample is given")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per implementation; the best is reported")
+    args = ap.parse_args()
+
+    if args.sample_dir:
+        texts = load_sample(args.sample_dir)
+    else:
+        rng = random.Random(42)
+        texts = [synthetic_resume(i, rng) for i in range(args.synthetic)]
+    if not texts:
+        print("No resumes to benchmark.")
+        return
+
+    # Phones can legitimately differ: the scanner no longer takes digits from URLs or date ranges
+    mismatches = {"email": 0, "phone": 0, "links": 0}
+    for text in texts:
+        old, new = legacy_basics(text), scanner_basics(text)
+        for index, field in enumerate(mismatches):
+            mismatches[field] += old[index] != new[index]
+    chars = sum(len(t) for t in texts)
+    print(f"{len(texts)} resumes, {chars / len(texts):.0f} chars on average; differing results: {mismatches}")
+
+    legacy = bench(legacy_basics, texts, args.repeat)
+    scanner = bench(scanner_basics, texts, args.repeat)
+    for label, seconds in (("per-field regex", legacy), ("single-pass scanner", scanner)):
+        print(f"{label:>20}: {seconds:.3f}s total, {seconds / len(texts) * 1e6:.1f}us per resume")
+    print(f"{'speedup':>20}: {legacy / scanner:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Recall benchmark for the dense vector storage settings (QDRANT_QUANTIZATION,
+QDRANT_RESCORE, QDRANT_OVERSAMPLING, QDRANT_HNSW_*, QDRANT_SEARCH_EF).
+Compares approximate search, run with the same search params the app uses,
+against an exact full scan of the original (unquantized) vectors and reports recall@k, latency and the estimated
+RAM for the dense vectors. Needs a Qdrant server: local mode ignores
+quantization and HNSW settings.
+
+    # Synthetic temporary collection, built with the current settings; queries come
+    # from the same clusters but are not inserted
+    QDRANT_QUANTIZATION=binary python scripts/bench_vector_recall.py --points 20000 --dim 1536
+
+    # Existing collection; queries are its own vectors, with each query point
+    # excluded from both result lists so it cannot find itself
+    python scripts/bench_vector_recall.py --collection candidates_live --vector resume
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from app.core.config import settings
+from app.services.vector_store import vector_store, RESUME_VECTOR
+
+# Bytes per dimension kept in RAM for search, by quantization kind
+BYTES_PER_DIM = {"none": 4, "scalar": 1, "binary": 1 / 8}
+
+def clustered_vectors(count, dim, clusters=50, spread=0.3, seed=7):
+    # Embeddings cluster by topic; uniform random vectors would make ANN look unrealistically hard
+    rng = random.Random(seed)
+    centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+    for _ in range(count):
+        center = rng.choice(centers)
+        yield [c + rng.gauss(0, spread) for c in center]
+
+def build_synthetic(client, name, vector, points, dim, queries, batch_size=256):
+    """Inserts `points` clustered vectors and returns `queries` more from the same clusters, held out of the collection."""
+    client.create_collection(
+        collection_name=name,
+        vectors_config={vector: vector_store.dense_vector_params(dim)}
+    )
+    vectors = clustered_vectors(points + queries, dim)
+    batch = []
+    for _ in range(points):
+        batch.append(models.PointStruct(id=str(uuid.uuid4()), vector={vector: next(vectors)}))
+        if len(batch) == batch_size:
+            client.upsert(collection_name=name, points=batch, wait=False)
+            batch = []
+    if batch:
+        client.upsert(collection_name=name, points=batch, wait=True)
+    # Wait until the HNSW (and quantization) build finishes, or we'd measure a brute-force scan
+    while client.get_collection(name).status != models.CollectionStatus.GREEN:
+        time.sleep(1)
+    return [(None, vec) for vec in vectors]
+
+def sample_queries(client, name, vector, count):
+    """(point id, vector) pairs from the collection; the id is excluded when searching."""
+    points, _ = client.scroll(collection_name=name, limit=count, with_payload=False, with_vectors=[vector])
+    return [(p.id, p.vector[vector]) for p in points if p.vector and vector in p.vector]
+
+def search(client, name, vector, query, k, params, exclude_id=None):
+    query_filter = None
+    if exclude_id is not None:
+        query_filter = models.Filter(must_not=[models.HasIdCondition(has_id=[exclude_id])])
+    start = time.perf_counter()
+    response = client.query_points(collection_name=name, query=query, using=vector, limit=k,
+                                   query_filter=query_filter, search_params=params)
+    return [p.id for p in response.points], time.perf_counter() - start
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--collection", help="Existing collection to benchmark (default: synthetic temporary collection)")
+    ap.add_argument("--vector", default=RESUME_VECTOR)
+    ap.add_argument("--points", type=int, default=10000)
+    ap.add_argument("--dim", type=int, default=1536)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("-k", type=int, default=10)
+    ap.add_argument("--keep", action="store_true", help="Keep the synthetic collection afterwards")
+    args = ap.parse_args()
+
+    client = QdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
+    name = args.collection
+    synthetic = name is None
+    if synthetic:
+        name = f"bench_recall_{uuid.uuid4().hex[:8]}"
+        print(f"Building {name}: {args.points} x {args.dim}-dim vectors ...")
+        queries = build_synthetic(client, name, args.vector, args.points, args.dim, args.queries)
+
+    try:
+        if not synthetic:
+            queries = sample_queries(client, name, args.vector, args.queries)
+        if not queries:
+            print(f"No '{args.vector}' vectors in {name}")
+            return
+        approx_params = vector_store.search_params()
+        exact_params = vector_store.search_params(exact=True)
+        recalls, approx_times, exact_times = [], [], []
+        for exclude_id, query in queries:
+            truth, exact_time = search(client, name, args.vector, query, args.k, exact_params, exclude_id)
+            found, approx_time = search(client, name, args.vector, query, args.k, approx_params, exclude_id)
+            if truth:
+                recalls.append(len(set(found) & set(truth)) / len(truth))
+            exact_times.append(exact_time)
+            approx_times.append(approx_time)
+
+        info = client.get_collection(name)
+        count = info.points_count or 0
+        dim = info.config.params.vectors[args.vector].size
+        kind = settings.QDRANT_QUANTIZATION
+        full_mb = count * dim * BYTES_PER_DIM["none"] / 1e6
+        ram_mb = count * dim * BYTES_PER_DIM.get(kind, 4) / 1e6
+        if kind != "none" and not settings.QDRANT_ON_DISK_VECTORS:
+            ram_mb += full_mb # originals stay in RAM too unless QDRANT_ON_DISK_VECTORS=true
+
+        print(f"Collection:     {name} ({count} points, {dim}-dim '{args.vector}')")
+        print(f"Settings:       quantization={kind} rescore={settings.QDRANT_RESCORE} oversampling={settings.QDRANT_OVERSAMPLING} "
+              f"on_disk={settings.QDRANT_ON_DISK_VECTORS} m={settings.QDRANT_HNSW_M} ef_construct={settings.QDRANT_HNSW_EF_CONSTRUCT} "
+              f"ef={settings.QDRANT_SEARCH_EF or 'default'}")
+        print(f"Recall@{args.k}:      {sum(recalls) / len(recalls):.4f} (min {min(recalls):.2f}, {len(recalls)} queries)")
+        print(f"Latency p50/p95: approx {percentile(approx_times, 0.5) * 1000:.1f}/{percentile(approx_times, 0.95) * 1000:.1f} ms, "
+              f"exact {percentile(exact_times, 0.5) * 1000:.1f}/{percentile(exact_times, 0.95) * 1000:.1f} ms")
+        print(f"Vector RAM:     ~{ram_mb:.1f} MB (float32 in RAM: {full_mb:.1f} MB)")
+    finally:
+        if synthetic and not args.keep:
+            client.delete_collection(name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Removes duplicate vector points left by retried or re-run indexing (before point
+IDs were derived from the application ID). Keeps one point per application under
+its deterministic ID, updates the application's embedding_id when a point is
+re-keyed, and invalidates cached match results for the affected jobs. The point
+the application's embedding_id references in Appwrite is the one kept.
+
+    python scripts/compact_vectors.py          # report only
+    python scripts/compact_vectors.py --apply
+"""
+import os
+import sys
+import argparse
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.config import settings
+from app.core.appwrite import appwrite_service
+from app.core.logging_config import setup_logging
+from app.services.vector_store import vector_store
+from app.services.match_cache import match_cache
+
+def embedding_ids(application_ids: list) -> dict:
+    """{application_id: embedding_id} from the application documents."""
+    from appwrite.query import Query
+    db = appwrite_service.get_database()
+    found = {}
+    for start in range(0, len(application_ids), 100):
+        chunk = application_ids[start:start + 100]
+        try:
+            result = db.list_documents(
+                database_id=settings.DATABASE_ID,
+                collection_id=settings.APPLICATIONS_COLLECTION_ID,
+                queries=[Query.equal("$id", chunk), Query.limit(len(chunk))]
+            )
+        except Exception as e:
+            print(f"Failed to read embedding_id of {len(chunk)} applications: {e}")
+            continue
+        found.update({doc['$id']: doc['embedding_id'] for doc in result['documents'] if doc.get('embedding_id')})
+    return found
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--apply", action="store_true", help="Delete duplicates and re-key points (default: report only)")
+    args = ap.parse_args()
+
+    setup_logging()
+    stats = vector_store.compact_duplicates(apply=args.apply, embedding_ids=embedding_ids)
+    print(f"Collection:   {vector_store.collection_name}")
+    print(f"Points:       {stats['points']} ({stats['applications']} applications)")
+    print(f"Duplicates:   {stats['duplicates']}")
+    print(f"Re-keyed:     {len(stats['rekeyed'])}")
+    print(f"Jobs:         {len(stats['job_ids'])}")
+    if not args.apply:
+        print("Report only; run with --apply to compact.")
+        return
+
+    db = appwrite_service.get_database()
+    for application_id, vector_id in stats["rekeyed"].items():
+        try:
+            db.update_document(
+                database_id=settings.DATABASE_ID,
+                collection_id=settings.APPLICATIONS_COLLECTION_ID,
+                document_id=application_id,
+                data={"embedding_id": vector_id}
+            )
+        except Exception as e:
+            print(f"Failed to update embedding_id of application {application_id}: {e}")
+    # Rankings cached for these jobs still contain the duplicates
+    match_cache.invalidate(stats["job_ids"])
+
+if __name__ == "__main__":
+    main()
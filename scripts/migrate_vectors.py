@@ -0,0 +1,51 @@
+"""
+Online re-embedding migration for the vector collection behind the
+`candidates_live` alias (QDRANT_COLLECTION_ALIAS).
+Run it with the NEW embedding settings (e.g. EMBEDDING_PROVIDER) while the app
+keeps serving from the current collection:
+
+    python scripts/migrate_vectors.py            # copy + catch-up + alias swap (resumes if interrupted)
+    python scripts/migrate_vectors.py --no-swap  # stop before the swap; run --swap later
+    python scripts/migrate_vectors.py --swap
+    # roll out the new settings to the API and workers, then:
+    python scripts/migrate_vectors.py --catch-up # writes made by old-config workers during the rollout
+    python scripts/migrate_vectors.py --finish [--drop-source]
+    python scripts/migrate_vectors.py --status
+"""
+import os
+import sys
+import json
+import argparse
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.logging_config import setup_logging
+from app.services.vector_migration import vector_migration
+from app.worker import migrate_vector_collection, catch_up_vector_migration
+
+def main():
+    ap = argparse.ArgumentParser()
+    action = ap.add_mutually_exclusive_group()
+    action.add_argument("--status", action="store_true", help="Print the migration state and exit")
+    action.add_argument("--no-swap", action="store_true", help="Copy and catch up, but leave the alias alone")
+    action.add_argument("--swap", action="store_true", help="Swap the alias to a copied migration")
+    action.add_argument("--catch-up", action="store_true", help="Copy writes made to the old collection since the last pass")
+    action.add_argument("--finish", action="store_true", help="Close a swapped migration")
+    ap.add_argument("--drop-source", action="store_true", help="With --finish: delete the old collection")
+    args = ap.parse_args()
+
+    setup_logging()
+    if args.status:
+        state = vector_migration.status()
+    elif args.swap:
+        state = vector_migration.swap()
+    elif args.catch_up:
+        state = catch_up_vector_migration()
+    elif args.finish:
+        state = vector_migration.finish(drop_source=args.drop_source)
+    else:
+        state = migrate_vector_collection(swap=not args.no_swap)
+    print(json.dumps(state, indent=2) if state else "No migration has run.")
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,28 @@
-
 import os
 import sys
 import subprocess
 
-def run_worker():
+def run_worker(micro_batch=False):
     """
     Runs the RQ worker with the appropriate arguments for the operating system.
+    With micro_batch=True, runs the micro-batching worker loop instead, which
+    embeds pending applications in batches.
     """
-    cmd = ["rq", "worker", "resumes", "--url", "redis://localhost:6379/0"]
-    
-    if os.name == 'nt':
-        print("Detected Windows. Using rq.SimpleWorker to avoid os.fork() issues.")
-        cmd.extend(["--worker-class", "rq.SimpleWorker"])
-    
+    if micro_batch:
+        cmd = [sys.executable, "-c", "from backend.app.worker import run_micro_batch_worker; run_micro_batch_worker()"]
+    else:
+        cmd = ["rq", "worker", "resumes", "--url", "redis://localhost:6379/0"]
+
+        if os.name == 'nt':
+            print("Detected Windows. Using rq.SimpleWorker to avoid os.fork() issues.")
+            cmd.extend(["--worker-class", "rq.SimpleWorker"])
+
     print(f"Running command: {' '.join(cmd)}")
-    
+
     # Pass environment variable to trigger file logging in worker
     env = os.environ.copy()
     env["RQ_WORKER_LOGGING"] = "true"
-    
+
     try:
         subprocess.run(cmd, check=True, env=env)
     except KeyboardInterrupt:
@@ -28,4 +32,4 @@ def run_worker():
         sys.exit(1)
 
 if __name__ == "__main__":
-    run_worker()
+    run_worker(micro_batch="--micro-batch" in sys.argv)
@@ -63,13 +63,15 @@ def setup_database():
     create_attribute(APPLICATIONS_COLLECTION_ID, "job_id", "string", 255, True)
     create_attribute(APPLICATIONS_COLLECTION_ID, "candidate_id", "string", 255, True)
     create_attribute(APPLICATIONS_COLLECTION_ID, "resume_file_id", "string", 255, True)
-    create_attribute(APPLICATIONS_COLLECTION_ID, "status", "string", 50, True) # pending, processed, error
+    create_attribute(APPLICATIONS_COLLECTION_ID, "status", "string", 50, True) # pending, processed, failed, error, cancelled
     create_attribute(APPLICATIONS_COLLECTION_ID, "parsed_summary", "string", 5000, False)
     create_attribute(APPLICATIONS_COLLECTION_ID, "embedding_id", "string", 255, False)
     create_attribute(APPLICATIONS_COLLECTION_ID, "batch_id", "string", 255, False)
     
     # Indexes
     create_index(APPLICATIONS_COLLECTION_ID, "idx_batch", "key", ["batch_id"])
+    create_index(APPLICATIONS_COLLECTION_ID, "idx_batch_status", "key", ["batch_id", "status"])
+    create_index(APPLICATIONS_COLLECTION_ID, "idx_candidate", "key", ["candidate_id"])
 
 def setup_storage():
     print(f"Setting up Storage Bucket: {RESUMES_BUCKET_ID}")